@@ -1,71 +1,232 @@
+import html
 import folium
+from folium.plugins import MarkerCluster, HeatMap, HeatMapWithTime
+from jinja2 import Template
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import os
+from datetime import datetime, timedelta, timezone
+
+from processors.rollup import rollup_counts
+
+# Cluster bubbles show the number of incidents, not the number of points
+CLUSTER_ICON_JS = """
+function(cluster) {
+    var count = 0;
+    cluster.getAllChildMarkers().forEach(function(m) { count += m.feature.properties.count; });
+    var size = count < 10 ? 'small' : (count < 100 ? 'medium' : 'large');
+    return L.divIcon({
+        html: '<div><span>' + count + '</span></div>',
+        className: 'marker-cluster marker-cluster-' + size,
+        iconSize: new L.Point(40, 40)
+    });
+}
+"""
+
+
+class GeoJsonMarkerCluster(MarkerCluster):
+    """One embedded GeoJSON FeatureCollection clustered client-side"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.markerClusterGroup(
+                {{ this.options|tojson }}
+            );
+            {{ this.get_name() }}.options.iconCreateFunction =
+                {{ this.icon_create_function.strip() }};
+            L.geoJSON({{ this.data|tojson }}, {
+                pointToLayer: function(feature, latlng) {
+                    var p = feature.properties;
+                    return L.circleMarker(latlng, {
+                        radius: Math.min(6 + Math.log2(p.count) * 2, 18),
+                        color: p.color, fill: true, fillOpacity: 0.7
+                    }).bindPopup(
+                        '<b>' + p.count + ' incident(s)</b><br>' + p.titles.join('<br>') +
+                        '<br>Sources: ' + p.sources.join(', ')
+                    );
+                }
+            }).addTo({{ this.get_name() }});
+            {{ this.get_name() }}.addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+        """)
+
+    def __init__(self, data, name=None, **kwargs):
+        super().__init__(name=name, icon_create_function=CLUSTER_ICON_JS, **kwargs)
+        self._name = "GeoJsonMarkerCluster"
+        self.data = data
+
 
 class GeoAnalyzer:
     def __init__(self, incidents_df):
         self.df = incidents_df
     
-    def create_incident_map(self, output='map.html'):
-        """Create interactive incident map"""
-        if self.df.empty or self.df['lat'].isna().all():
+    def create_incident_map(self, output='map.html', heatmap=True, time_slider=False,
+                            titles_per_point=5):
+        """Create interactive incident map
+        
+        Incidents at the same coordinates collapse into one GeoJSON feature
+        (count, newest titles, sources), so file size is bounded by the
+        number of distinct places rather than the number of incidents.
+        """
+        if self.df.empty or 'lat' not in self.df.columns or self.df['lat'].isna().all():
             print("No geocode data for mapping")
             return None
         
+        points = self.df.dropna(subset=['lat', 'lon'])
+        
         # Center on J&K/Northeast
         m = folium.Map(location=[28.5, 78.0], zoom_start=6)
+        GeoJsonMarkerCluster(
+            self._point_features(points, titles_per_point), name='Incidents'
+        ).add_to(m)
         
-        # Add incidents
-        for idx, row in self.df.dropna(subset=['lat']).iterrows():
-            folium.CircleMarker(
-                location=[row['lat'], row['lon']],
-                radius=8,
-                popup=f"{row['title'][:100]}...<br>Source: {row['source']}",
-                color='red' if row['incident_type'] == 'Terror' else 'orange',
-                fill=True,
-                fillOpacity=0.7
+        if heatmap:
+            weighted = points[['lat', 'lon']].round(3).value_counts().reset_index(name='weight')
+            HeatMap(
+                weighted[['lat', 'lon', 'weight']].to_numpy().tolist(),
+                name='Heatmap', show=False, radius=20
             ).add_to(m)
         
+        if time_slider and 'published' in points.columns:
+            days, frames = self._daily_frames(points)
+            if frames:
+                HeatMapWithTime(frames, index=days, name='Timeline', radius=20,
+                                auto_play=False).add_to(m)
+        
+        folium.LayerControl().add_to(m)
         m.save(output)
         print(f"Map saved: {output}")
         return output
     
-    def create_stats_charts(self, output_dir='charts'):
-        """Create statistical charts"""
+    @staticmethod
+    def _point_features(points, titles_per_point=5):
+        """GeoJSON FeatureCollection with one feature per distinct location"""
+        frame = pd.DataFrame({
+            'lat': points['lat'].round(4).to_numpy(),
+            'lon': points['lon'].round(4).to_numpy(),
+            'title': points['title'].to_numpy(),
+            'source': points['source'].to_numpy(),
+            'terror': (points['incident_type'] == 'Terror').to_numpy() if 'incident_type' in points.columns
+                      else np.zeros(len(points), dtype=bool),
+        })
+        if 'published' in points.columns:
+            published = pd.to_datetime(points['published'], errors='coerce', utc=True)
+            frame = frame.iloc[np.argsort(published.values, kind='stable')[::-1]]
+        
+        grouped = frame.groupby(['lat', 'lon'], sort=False)
+        summary = grouped.agg(count=('title', 'size'), terror=('terror', 'any')).reset_index()
+        
+        # Escape only the handful of strings that end up in the file
+        newest = grouped.head(titles_per_point)
+        newest = newest.assign(title=newest['title'].fillna('').astype(str).str.slice(0, 100).map(html.escape))
+        titles = newest.groupby(['lat', 'lon'], sort=False)['title'].agg(list)
+        sources = frame[['lat', 'lon', 'source']].drop_duplicates()
+        sources = sources.assign(source=sources['source'].fillna('Unknown').astype(str).map(html.escape))
+        sources = sources.groupby(['lat', 'lon'], sort=False)['source'].agg(list)
+        
+        features = [
+            {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                'properties': {
+                    'count': int(count),
+                    'color': 'red' if terror else 'orange',
+                    'titles': titles[(lat, lon)],
+                    'sources': sources[(lat, lon)][:10]
+                }
+            }
+            for lat, lon, count, terror in summary[['lat', 'lon', 'count', 'terror']].itertuples(index=False)
+        ]
+        return {'type': 'FeatureCollection', 'features': features}
+    
+    @staticmethod
+    def _daily_frames(points):
+        """Per-day [lat, lon, weight] lists for the time-slider heatmap"""
+        frame = pd.DataFrame({
+            'day': pd.to_datetime(points['published'], errors='coerce', utc=True).dt.floor('D').values,
+            'lat': points['lat'].round(3).to_numpy(),
+            'lon': points['lon'].round(3).to_numpy(),
+        }).dropna()
+        if frame.empty:
+            return [], []
+        counts = frame.groupby(['day', 'lat', 'lon']).size().reset_index(name='weight')
+        counts['weight'] = counts['weight'] / counts['weight'].max()
+        days, frames = [], []
+        for day, group in counts.groupby('day'):
+            days.append(pd.Timestamp(day).strftime('%Y-%m-%d'))
+            frames.append(group[['lat', 'lon', 'weight']].to_numpy().tolist())
+        return days, frames
+    
+    def create_stats_charts(self, output_dir='charts', rollup=None, window_days=30, trend_days=90,
+                            plotlyjs='cdn'):
+        """Create statistical charts from daily rollup counts
+        
+        With an IncidentRollup the charts cover the last window_days (and
+        trend_days for the timeline) of history and cost the same however
+        long the history is; without one they cover this run's incidents.
+        plotlyjs='cdn' loads plotly.js from its CDN, so each chart still
+        renders when sent on its own (the Telegram report uploads only the
+        HTML); 'directory' shares one local plotly.min.js for hosted copies.
+        """
         os.makedirs(output_dir, exist_ok=True)
         
-        if self.df.empty:
+        today = datetime.now(timezone.utc).date()
+        if rollup is not None:
+            counts = rollup.recent(max(window_days, trend_days, 14), today)
+            window = counts[counts['day'] >= str(today - timedelta(days=window_days - 1))]
+        else:
+            counts = window = rollup_counts(self.df)
+        if counts.empty:
             return {}
         
+        def total(frame, dim):
+            return frame.groupby(dim)['count'].sum().sort_values(ascending=False).reset_index()
+        
+        charts = {}
+        
+        def save(name, fig):
+            path = f"{output_dir}/{name}.html"
+            fig.write_html(path, include_plotlyjs=plotlyjs)
+            charts[name] = path
+        
         # Chart 1: Incidents by Region
-        region_chart = px.bar(
-            self.df.groupby('region').size().reset_index(name='count'),
-            x='region', y='count',
-            title='Incidents by Region'
-        )
-        region_chart.write_html(f"{output_dir}/regions.html")
+        save('regions', px.bar(total(window, 'region'), x='region', y='count', title='Incidents by Region'))
         
         # Chart 2: Incidents by Type
-        type_chart = px.pie(
-            self.df['incident_type'].value_counts().reset_index(),
-            values='count', names='incident_type',
-            title='Incident Types'
-        )
-        type_chart.write_html(f"{output_dir}/types.html")
+        save('types', px.pie(total(window, 'incident_type'), values='count', names='incident_type',
+                             title='Incident Types'))
         
         # Chart 3: Sources
-        source_chart = px.bar(
-            self.df['source'].value_counts().head(10).reset_index(),
-            x='source', y='count',
-            title='Top Sources'
-        )
-        source_chart.write_html(f"{output_dir}/sources.html")
-        
-        return {
-            'regions': f"{output_dir}/regions.html",
-            'types': f"{output_dir}/types.html",
-            'sources': f"{output_dir}/sources.html"
-      }
+        save('sources', px.bar(total(window, 'source').head(10), x='source', y='count', title='Top Sources'))
+        
+        # Chart 4: Daily incidents per region, zero-filled
+        daily = counts.pivot_table(index='day', columns='region', values='count', aggfunc='sum', fill_value=0)
+        days = pd.date_range(daily.index.min(), max(daily.index.max(), str(today)), freq='D').strftime('%Y-%m-%d')
+        daily = daily.reindex(days, fill_value=0).rename_axis('day').reset_index()
+        save('timeline', px.line(daily.melt(id_vars='day', var_name='region', value_name='count'),
+                                 x='day', y='count', color='region', title='Daily Incidents by Region'))
+        
+        # Chart 5: This week vs the week before, by region and type
+        this_start = str(today - timedelta(days=6))
+        last_start = str(today - timedelta(days=13))
+        current = counts[counts['day'] >= this_start]
+        previous = counts[(counts['day'] >= last_start) & (counts['day'] < this_start)]
+        trends = make_subplots(rows=1, cols=2, subplot_titles=('By Region', 'By Type'))
+        for col, dim in enumerate(['region', 'incident_type'], start=1):
+            compare = pd.DataFrame({
+                'this_week': current.groupby(dim)['count'].sum(),
+                'last_week': previous.groupby(dim)['count'].sum(),
+            }).fillna(0).sort_values('this_week', ascending=False)
+            change = [f"{(t - l) / l:+.0%}" if l else 'new' for t, l in zip(compare['this_week'], compare['last_week'])]
+            trends.add_trace(go.Bar(name='Previous 7 days', x=compare.index, y=compare['last_week'],
+                                    marker_color='lightgray', showlegend=col == 1), row=1, col=col)
+            trends.add_trace(go.Bar(name='Last 7 days', x=compare.index, y=compare['this_week'],
+                                    text=change, textposition='outside', marker_color='crimson',
+                                    showlegend=col == 1), row=1, col=col)
+        trends.update_layout(title='Week over Week', barmode='group')
+        save('trends', trends)
+        
+        return charts
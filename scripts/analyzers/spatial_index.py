@@ -0,0 +1,276 @@
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; broadcasts over numpy arrays"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def resolve_point(place):
+    """(lat, lon) for a gazetteer name/alias or a "lat,lon" string"""
+    from processors.gazetteer import load_gazetteer
+    found = load_gazetteer().lookup(place)
+    if found:
+        return found['lat'], found['lon']
+    try:
+        lat, lon = (float(part) for part in str(place).split(','))
+    except ValueError:
+        raise ValueError(f"Unknown place {place!r}: not in the gazetteer and not 'lat,lon'")
+    return lat, lon
+
+
+def _seconds(values):
+    """Epoch seconds as float64, NaN where the timestamp is missing"""
+    ts = pd.to_datetime(pd.Series(values), errors='coerce', utc=True, format='mixed')
+    seconds = ts.astype('int64').to_numpy().astype(float) / 1e9
+    seconds[ts.isna().to_numpy()] = np.nan
+    return seconds
+
+
+class SpatioTemporalIndex:
+    """Grid-bucketed index over geocoded incidents with a time dimension
+
+    Points are bucketed into cell_deg x cell_deg cells and sorted by
+    (cell, time), so a query only touches the cells its radius or box
+    overlaps and binary-searches each cell for the time window; exact
+    haversine distances are computed for the survivors only.
+    """
+
+    def __init__(self, frame, cell_deg=0.1, time_col='published'):
+        self.cell_deg = cell_deg
+        self.ncols = int(np.ceil(360 / cell_deg))
+
+        lat = pd.to_numeric(frame['lat'], errors='coerce').to_numpy(dtype=float)
+        lon = pd.to_numeric(frame['lon'], errors='coerce').to_numpy(dtype=float)
+        ts = _seconds(frame[time_col]) if time_col in frame.columns else np.full(len(frame), np.nan)
+        located = np.flatnonzero(~np.isnan(lat) & ~np.isnan(lon))
+
+        keys = self._keys(lat[located], lon[located])
+        # NaN times sort last within their cell
+        order = np.lexsort((ts[located], keys))
+        self.frame = frame
+        self.rows = located[order]
+        self.lat, self.lon, self.ts = lat[self.rows], lon[self.rows], ts[self.rows]
+        self.keys = keys[order]
+        self.cells, self.starts = np.unique(self.keys, return_index=True)
+        self.ends = np.append(self.starts[1:], len(self.keys))
+        self.time_order = np.argsort(self.ts, kind='stable')
+
+    @classmethod
+    def from_store(cls, store, start=None, end=None, cell_deg=0.1):
+        columns = ['lat', 'lon', 'published', 'title', 'url', 'source', 'region', 'district', 'incident_type']
+        frame = store.query(columns=columns, start=start, end=end).reindex(columns=columns)
+        return cls(frame, cell_deg=cell_deg)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _cell(self, lat, lon):
+        return (np.floor((np.asarray(lat) + 90) / self.cell_deg).astype(np.int64),
+                np.floor((np.asarray(lon) + 180) / self.cell_deg).astype(np.int64))
+
+    def _keys(self, lat, lon):
+        row, col = self._cell(lat, lon)
+        return row * self.ncols + col
+
+    def _slices(self, min_lat, min_lon, max_lat, max_lon, start=None, end=None):
+        """Positions (into the sorted arrays) of points in cells overlapping the box"""
+        if not len(self.cells):
+            return np.empty(0, dtype=np.int64)
+        r0, c0 = self._cell(min_lat, min_lon)
+        r1, c1 = self._cell(max_lat, max_lon)
+        rows, cols = np.meshgrid(np.arange(r0, r1 + 1), np.arange(c0, c1 + 1), indexing='ij')
+        wanted = (rows * self.ncols + cols).ravel()
+        at = np.searchsorted(self.cells, wanted)
+        present = at[(at < len(self.cells)) & (self.cells[np.minimum(at, len(self.cells) - 1)] == wanted)]
+
+        lo, hi = self.starts[present], self.ends[present]
+        if start is not None or end is not None:
+            # Each cell is sorted by time, so the window is one slice per cell
+            t0 = -np.inf if start is None else _seconds([start])[0]
+            t1 = np.inf if end is None else _seconds([end])[0]
+            bounds = [(s + np.searchsorted(self.ts[s:e], t0, 'left'), s + np.searchsorted(self.ts[s:e], t1, 'right'))
+                      for s, e in zip(lo, hi)]
+            lo = np.array([b[0] for b in bounds], dtype=np.int64)
+            hi = np.array([b[1] for b in bounds], dtype=np.int64)
+        counts = np.maximum(hi - lo, 0)
+        if not counts.sum():
+            return np.empty(0, dtype=np.int64)
+        offsets = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        return np.arange(counts.sum()) + offsets
+
+    def radius(self, lat, lon, radius_km, start=None, end=None):
+        """Incidents within radius_km of (lat, lon), optionally in [start, end], nearest first"""
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = min(180.0, radius_km / (KM_PER_DEGREE * max(np.cos(np.radians(lat)), 1e-6)))
+        pos = self._slices(lat - dlat, lon - dlon, lat + dlat, lon + dlon, start, end)
+        distance = haversine_km(lat, lon, self.lat[pos], self.lon[pos])
+        keep = distance <= radius_km
+        pos, distance = pos[keep], distance[keep]
+        order = np.argsort(distance, kind='stable')
+        return self._result(pos[order], distance_km=distance[order])
+
+    def near(self, place, radius_km, hours=None, now=None):
+        """Incidents within radius_km of a gazetteer place (or "lat,lon") in the last `hours`"""
+        lat, lon = resolve_point(place)
+        start = None
+        if hours is not None:
+            start = pd.Timestamp(now or pd.Timestamp.now(tz='UTC')) - pd.Timedelta(hours=hours)
+        return self.radius(lat, lon, radius_km, start=start, end=now)
+
+    def bbox(self, min_lon, min_lat, max_lon, max_lat, start=None, end=None):
+        """Incidents inside [min_lon, min_lat, max_lon, max_lat] (config bbox order)"""
+        pos = self._slices(min_lat, min_lon, max_lat, max_lon, start, end)
+        keep = ((self.lat[pos] >= min_lat) & (self.lat[pos] <= max_lat)
+                & (self.lon[pos] >= min_lon) & (self.lon[pos] <= max_lon))
+        return self._result(pos[keep])
+
+    def window(self, start=None, end=None):
+        """Incidents published in [start, end], oldest first"""
+        times = self.ts[self.time_order]
+        lo = 0 if start is None else np.searchsorted(times, _seconds([start])[0], 'left')
+        hi = np.searchsorted(times, np.inf, 'right') if end is None else np.searchsorted(times, _seconds([end])[0], 'right')
+        return self._result(self.time_order[lo:hi])
+
+    def _result(self, pos, **extra):
+        result = self.frame.iloc[self.rows[pos]].copy()
+        for name, values in extra.items():
+            result[name] = values
+        return result
+
+    def neighbor_pairs(self, eps_km, eps_seconds, chunk=2_000_000):
+        """All directed (i, j) pairs, i != j, within eps_km and eps_seconds
+
+        Positions refer to the index's sorted arrays; points without a
+        timestamp have no neighbours. Only cells within eps_km of a point's
+        cell are searched (more of them in longitude away from the equator).
+        Because the arrays are sorted by (cell, time), one combined key lets
+        a single searchsorted per cell offset find every point's candidate
+        range at once; distances are computed for those candidates only.
+        """
+        timed = np.flatnonzero(~np.isnan(self.ts))
+        if not len(timed):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        eps = int(np.ceil(eps_seconds))
+        t = np.round(self.ts[timed]).astype(np.int64)
+        t += eps - t.min()
+        span = int(t.max()) + eps + 1
+        keys = self.keys[timed]
+        combined = keys * span + t
+
+        max_lat = min(np.abs(self.lat[timed]).max() + eps_km / KM_PER_DEGREE, 89.0)
+        reach_rows = int(np.ceil(eps_km / KM_PER_DEGREE / self.cell_deg))
+        reach_cols = int(np.ceil(eps_km / (KM_PER_DEGREE * np.cos(np.radians(max_lat))) / self.cell_deg))
+
+        edges_i, edges_j = [], []
+        for dr in range(-reach_rows, reach_rows + 1):
+            for dc in range(-reach_cols, reach_cols + 1):
+                base = (keys + dr * self.ncols + dc) * span + t
+                lo = np.searchsorted(combined, base - eps, 'left')
+                hi = np.searchsorted(combined, base + eps, 'right')
+                counts = hi - lo
+                bounds = np.concatenate(([0], np.cumsum(counts)))
+                # Split so no chunk materializes more than `chunk` candidate pairs
+                cuts = np.unique(np.searchsorted(bounds, np.arange(0, bounds[-1], chunk), 'right') - 1)
+                for s, e in zip(cuts, np.append(cuts[1:], len(counts))):
+                    n = int(bounds[e] - bounds[s])
+                    if not n:
+                        continue
+                    i = np.repeat(np.arange(s, e), counts[s:e])
+                    j = np.arange(n) + np.repeat(lo[s:e] - (bounds[s:e] - bounds[s]), counts[s:e])
+                    i, j = timed[i], timed[j]
+                    keep = (i != j) & (haversine_km(self.lat[i], self.lon[i], self.lat[j], self.lon[j]) <= eps_km)
+                    edges_i.append(i[keep])
+                    edges_j.append(j[keep])
+        if not edges_i:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(edges_i), np.concatenate(edges_j)
+
+    def cluster(self, eps_km=25, eps_hours=48, min_samples=5):
+        """ST-DBSCAN labels (per sorted position); -1 is noise
+
+        A core point has at least min_samples incidents (itself included)
+        within eps_km and eps_hours; clusters are connected core points
+        plus the border points they reach.
+        """
+        n = len(self.rows)
+        labels = np.full(n, -1, dtype=np.int64)
+        timed = ~np.isnan(self.ts)
+        if not n:
+            return labels
+        i, j = self.neighbor_pairs(eps_km, eps_hours * 3600)
+        degree = np.bincount(i, minlength=n) + 1
+        core = (degree >= min_samples) & timed
+
+        # Connected components over core-core edges by min-label propagation
+        both = core[i] & core[j]
+        ci, cj = i[both], j[both]
+        component = np.arange(n)
+        while True:
+            updated = component.copy()
+            np.minimum.at(updated, ci, component[cj])
+            updated = updated[updated]
+            if np.array_equal(updated, component):
+                break
+            component = updated
+        labels[core] = component[core]
+
+        # Border points join the cluster of a core neighbour
+        border = core[j] & ~core[i]
+        labels[i[border]] = component[j[border]]
+
+        # Renumber clusters 0..k-1
+        clustered = labels >= 0
+        _, labels[clustered] = np.unique(labels[clustered], return_inverse=True)
+        return labels
+
+    def hotspots(self, eps_km=25, eps_hours=48, min_samples=5, now=None, recent_hours=24, growth=2.0):
+        """One row per space-time cluster, flagging emerging hotspots
+
+        A cluster is emerging when its last recent_hours hold at least
+        min_samples incidents and at least `growth` times what its earlier
+        rate would predict for a window that long.
+        """
+        labels = self.cluster(eps_km, eps_hours, min_samples)
+        clustered = labels >= 0
+        columns = ['cluster', 'size', 'lat', 'lon', 'first_seen', 'last_seen', 'recent', 'emerging']
+        if not clustered.any():
+            return pd.DataFrame(columns=columns)
+
+        now = _seconds([now or pd.Timestamp.now(tz='UTC')])[0]
+        recent_start = now - recent_hours * 3600
+        frame = pd.DataFrame({
+            'cluster': labels[clustered],
+            'lat': self.lat[clustered],
+            'lon': self.lon[clustered],
+            'ts': self.ts[clustered],
+            'recent': self.ts[clustered] >= recent_start,
+        })
+        summary = frame.groupby('cluster').agg(
+            size=('ts', 'size'), lat=('lat', 'mean'), lon=('lon', 'mean'),
+            first=('ts', 'min'), last=('ts', 'max'), recent=('recent', 'sum')
+        ).reset_index()
+
+        earlier = summary['size'] - summary['recent']
+        span_hours = ((np.minimum(summary['last'], recent_start) - summary['first']) / 3600).clip(lower=recent_hours)
+        expected = earlier / span_hours * recent_hours
+        summary['emerging'] = (summary['recent'] >= min_samples) & (summary['recent'] >= growth * expected)
+        summary['first_seen'] = pd.to_datetime(summary['first'], unit='s', utc=True)
+        summary['last_seen'] = pd.to_datetime(summary['last'], unit='s', utc=True)
+
+        for col in ['region', 'district']:
+            if col in self.frame.columns:
+                values = self.frame[col].to_numpy()[self.rows[clustered]]
+                top = pd.DataFrame({'cluster': labels[clustered], col: values}).dropna()
+                summary[col] = summary['cluster'].map(
+                    top.groupby('cluster')[col].agg(lambda v: v.value_counts().index[0])
+                )
+                columns.append(col)
+        return summary[columns].sort_values(['emerging', 'recent', 'size'], ascending=False).reset_index(drop=True)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark classify_incidents against the legacy iterrows classifier
+
+Usage (from scripts/): PYTHONPATH=.. python -m benchmarks.bench_classify [rows]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import make_incidents
+from processors.data_processor import classify_incidents
+
+def legacy_classify(df, config):
+    """The original row-wise implementation, kept for comparison"""
+    df = df.copy()
+    df['incident_type'] = 'Other'
+
+    def get_full_text(row):
+        text = []
+        for col in ['title', 'description', 'text', 'summary']:
+            val = row.get(col, '')
+            if pd.notna(val) and val:
+                text.append(str(val))
+        return ' '.join(text).lower()
+
+    df['full_text'] = df.apply(get_full_text, axis=1)
+    keywords = config.get('keywords', {})
+    terror_kws = keywords.get('terror', [])
+    encounter_kws = keywords.get('encounter', [])
+    attack_kws = keywords.get('attack', [])
+
+    for idx, row in df.iterrows():
+        text = row['full_text']
+        if any(kw in text for kw in terror_kws):
+            df.at[idx, 'incident_type'] = 'Terror'
+        elif any(kw in text for kw in encounter_kws):
+            df.at[idx, 'incident_type'] = 'Encounter'
+        elif any(kw in text for kw in attack_kws):
+            df.at[idx, 'incident_type'] = 'Attack'
+    return df
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main(rows=100_000):
+    config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.yaml')
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+
+    df = make_incidents(rows)
+    legacy = timed(legacy_classify, df, config)
+    vectorized = timed(classify_incidents, df, config)
+
+    print(f"📊 classify_incidents @ {rows:,} rows")
+    print(f"  legacy iterrows : {legacy:8.2f}s ({rows / legacy:,.0f} rows/s)")
+    print(f"  compiled matcher: {vectorized:8.2f}s ({rows / vectorized:,.0f} rows/s)")
+    print(f"  speedup         : {legacy / vectorized:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
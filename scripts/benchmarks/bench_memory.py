@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Memory of incident records and frames, legacy vs compact
+
+Records: collector output as dicts vs slotted Incident records, with
+fresh string objects per item as scrapers produce them. Frames: the
+geocoded batch with the legacy 'full_text' copy next to 'content' vs the
+compacted frame the sinks now receive.
+
+Usage (from scripts/): PYTHONPATH=.. python -m benchmarks.bench_memory [rows]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_pipeline import load_config
+from benchmarks.corpus import make_incidents
+from benchmarks.stubs import stub_geocoder
+from processors.data_processor import deduplicate_data, classify_incidents
+from processors.incident import Incident, FIELDS, compact_frame
+from processors.stream import micro_batches
+
+
+def fresh(value):
+    """A new string object, as each parsed feed entry carries its own"""
+    return value.encode().decode() if isinstance(value, str) else value
+
+
+def traced(build):
+    """(result, bytes allocated by build())"""
+    tracemalloc.start()
+    try:
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def main(rows=100_000):
+    config = load_config()
+    corpus = make_incidents(rows)
+    rows_as_lists = [corpus[name].tolist() for name in FIELDS if name in corpus.columns]
+    names = [name for name in FIELDS if name in corpus.columns]
+
+    _, dict_bytes = traced(lambda: [
+        {name: fresh(value) for name, value in zip(names, values)} for values in zip(*rows_as_lists)])
+    _, record_bytes = traced(lambda: [
+        Incident(**{name: fresh(value) for name, value in zip(names, values) if value is not None})
+        for values in zip(*rows_as_lists)])
+
+    with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+        geocoder, _ = stub_geocoder(os.path.join(workdir, 'geocode.sqlite'))
+        legacy, compact = [], []
+        for batch in micro_batches(corpus, 500):
+            batch = deduplicate_data(batch, None, None)
+            batch = geocoder.geocode_incidents(classify_incidents(batch, config))
+            # What classify_incidents used to add: a second joined copy of the text
+            legacy.append(batch.assign(full_text=batch['content'].map(fresh)).astype(
+                {col: object for col in batch.columns if isinstance(batch[col].dtype, pd.CategoricalDtype)}))
+            compact.append(compact_frame(batch))
+    legacy = pd.concat(legacy, ignore_index=True)
+    compact = compact_frame(pd.concat(compact, ignore_index=True))
+
+    print(f"🧮 incident memory @ {rows:,} rows")
+    print(f"  records : dicts {dict_bytes / 2**20:8.1f} MB -> Incident {record_bytes / 2**20:8.1f} MB "
+          f"({record_bytes / dict_bytes - 1:+.0%})")
+    print(f"  frame   : legacy {frame_mb(legacy):8.1f} MB -> compact {frame_mb(compact):8.1f} MB "
+          f"({frame_mb(compact) / frame_mb(legacy) - 1:+.0%}, {len(compact):,} rows)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Benchmark every pipeline stage on the synthetic corpus, offline
+
+Stages run in pipeline order on the same seeded corpus: dedup, classify,
+geocode and compact per micro-batch (as the streaming pipeline does),
+then the map and charts over the whole result. Geocoding uses a stub
+backend and a throwaway cache, so nothing touches the network. Each stage reports
+throughput, per-batch latency (p50/p95) and tracemalloc peak memory;
+memory is measured in a separate pass so tracing does not skew timings.
+
+Results can be saved as a baseline and later runs compared against it:
+a stage fails when its throughput drops, or its peak memory grows, by
+more than the tolerance. Throughput is compared relative to a fixed
+reference workload timed in the same run (and stored with the
+baseline), so a slower or busier machine does not read as a regression.
+
+Usage (from scripts/): PYTHONPATH=.. python -m benchmarks.bench_pipeline [--rows 1000 100000]
+    [--save-baseline] [--compare] [--tolerance 0.25] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.geo_analyzer import GeoAnalyzer
+from benchmarks.corpus import make_incidents, SIZES
+from benchmarks.stubs import stub_geocoder
+from processors.data_processor import deduplicate_data, classify_incidents
+from processors.incident import compact_frame
+from processors.rollup import IncidentRollup
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+STAGES = ['dedup', 'classify', 'geocode', 'compact', 'map', 'charts']
+# Stages faster than this are too noisy to gate on
+MIN_SECONDS = 0.05
+REFERENCE_KEY = 'reference_s'
+
+
+def load_config():
+    config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.yaml')
+    with open(config_path) as f:
+        return yaml.safe_load(f)
+
+
+def batched(fn, batch_size):
+    """Apply fn per micro-batch; returns (combined output, per-batch seconds)"""
+    def run(df):
+        parts, latencies = [], []
+        for start in range(0, len(df), batch_size):
+            began = time.perf_counter()
+            parts.append(fn(df.iloc[start:start + batch_size]))
+            latencies.append(time.perf_counter() - began)
+        parts = [part for part in parts if not part.empty]
+        return (pd.concat(parts, ignore_index=True) if parts else df.iloc[:0]), latencies
+    return run
+
+
+def whole(fn):
+    def run(df):
+        began = time.perf_counter()
+        fn(df)
+        return df, [time.perf_counter() - began]
+    return run
+
+
+def build_stages(config, workdir):
+    dedup = config.get('dedup', {}) or {}
+    batch_size = (config.get('pipeline', {}) or {}).get('batch_size', 500)
+    geocoder, backend = stub_geocoder(os.path.join(workdir, 'geocode.sqlite'))
+
+    def charts(df):
+        rollup = IncidentRollup(os.path.join(workdir, 'rollup.sqlite'))
+        rollup.add(df)
+        GeoAnalyzer(df).create_stats_charts(os.path.join(workdir, 'charts'), rollup)
+        rollup.close()
+
+    stages = {
+        'dedup': batched(lambda b: deduplicate_data(
+            b, None, dedup.get('near_duplicate_threshold'), dedup.get('num_perm', 64),
+            dedup.get('max_hours_apart', 48)), batch_size),
+        'classify': batched(lambda b: classify_incidents(b, config), batch_size),
+        'geocode': batched(geocoder.geocode_incidents, batch_size),
+        'compact': batched(compact_frame, batch_size),
+        'map': whole(lambda df: GeoAnalyzer(df).create_incident_map(os.path.join(workdir, 'map.html'))),
+        'charts': whole(charts),
+    }
+    return stages, geocoder, backend
+
+
+def measure(rows, stages=STAGES, seed=42, repeat=3):
+    """{stage: {rows, seconds, rows_per_s, p50_ms, p95_ms, peak_mb}} for one corpus size
+
+    Each stage keeps its fastest of `repeat` timing passes, each on fresh
+    state, so a busy moment on the machine does not set the number.
+    """
+    config = load_config()
+    corpus = make_incidents(rows, seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+        for attempt in range(repeat):
+            # Timing pass: each stage consumes the previous stage's output
+            attempt_dir = os.path.join(workdir, f"timing-{attempt}")
+            os.makedirs(attempt_dir)
+            runners, geocoder, backend = build_stages(config, attempt_dir)
+            inputs, df = {}, corpus
+            for name in STAGES:
+                if name not in stages and name in ('map', 'charts'):
+                    continue
+                inputs[name] = df
+                began = time.perf_counter()
+                df, latencies = runners[name](df)
+                seconds = time.perf_counter() - began
+                if name in results and results[name]['seconds'] <= seconds:
+                    continue
+                results[name] = {
+                    'rows': len(inputs[name]),
+                    'seconds': round(seconds, 4),
+                    'rows_per_s': round(len(inputs[name]) / seconds, 1) if seconds else None,
+                    'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3),
+                    'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 3),
+                }
+            results['geocode']['backend_calls'] = backend.calls
+
+        # Memory pass on fresh state (a warm geocode cache would hide its allocations)
+        memory_dir = os.path.join(workdir, 'memory')
+        os.makedirs(memory_dir)
+        runners, _, _ = build_stages(config, memory_dir)
+        tracemalloc.start()
+        try:
+            for name in results:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                runners[name](inputs[name])
+                results[name]['peak_mb'] = round((tracemalloc.get_traced_memory()[1] - before) / 2**20, 2)
+        finally:
+            tracemalloc.stop()
+    return {name: result for name, result in results.items() if name in stages}
+
+
+def reference_seconds(repeat=7):
+    """Fastest time of a fixed pandas/numpy/regex/pure-Python workload unrelated to the pipeline code"""
+    rng = np.random.default_rng(0)
+    words = np.array(['kupwara', 'encounter', 'militants', 'police', 'market', 'search', 'convoy', 'district'])
+    text = pd.Series([' '.join(row) for row in words[rng.integers(0, len(words), (50_000, 12))]])
+    pattern = re.compile(r"\b(?:kup(?:wara)|encounter|convoy)\b")
+    values = rng.random(300_000)
+
+    def work():
+        text.str.lower().str.contains('police market')
+        sum(len(pattern.findall(doc)) for doc in text.tolist())
+        np.sort(values)
+        pd.DataFrame({'k': text.str.slice(0, 4), 'v': values[:len(text)]}).groupby('k')['v'].sum()
+
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        work()
+        timings.append(time.perf_counter() - began)
+    return min(timings)
+
+
+def compare(current, baseline, tolerance=0.25, reference=None):
+    """Regression messages for stages slower or hungrier than the baseline
+
+    With reference (this run's reference_seconds) and one stored in the
+    baseline, baseline throughput is scaled by their ratio first, so the
+    check is relative to this machine's speed right now. A geocode stage
+    that never called the stub backend is a failure too: its timing
+    would not cover the network path at all.
+    """
+    scale = 1.0
+    if reference and baseline.get(REFERENCE_KEY):
+        scale = baseline[REFERENCE_KEY] / reference
+    failures = []
+    for size, stages in current.items():
+        if 'geocode' in stages and not stages['geocode'].get('backend_calls'):
+            failures.append(f"geocode @ {size} rows: no backend calls, network path not exercised")
+        for name, result in stages.items():
+            base = baseline.get(size, {}).get(name)
+            if not base:
+                continue
+            expected = base['rows_per_s'] * scale
+            if base['seconds'] >= MIN_SECONDS and result['rows_per_s'] < expected * (1 - tolerance):
+                failures.append(f"{name} @ {size} rows: {result['rows_per_s']:,.0f} rows/s "
+                                f"vs baseline {expected:,.0f} (scaled x{scale:.2f})")
+            if base.get('peak_mb') and result['peak_mb'] > base['peak_mb'] * (1 + tolerance) + 1:
+                failures.append(f"{name} @ {size} rows: peak {result['peak_mb']:.1f} MB "
+                                f"vs baseline {base['peak_mb']:.1f} MB")
+    return failures
+
+
+def print_results(rows, results):
+    print(f"📊 pipeline stages @ {rows:,} rows")
+    print(f"  {'stage':<9} {'rows':>9} {'seconds':>9} {'rows/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'peak MB':>8}")
+    for name, r in results.items():
+        print(f"  {name:<9} {r['rows']:>9,} {r['seconds']:>9.3f} {r['rows_per_s'] or 0:>11,.0f} "
+              f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['peak_mb']:>8.1f}")
+    if 'geocode' in results:
+        print(f"  geocode backend calls: {results['geocode']['backend_calls']:,}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark of pipeline stages")
+    parser.add_argument('--rows', type=int, nargs='+', default=SIZES[:2],
+                        help=f"corpus sizes (default {SIZES[:2]}; {SIZES[-1]:,} is the large run)")
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="write results as the new baseline")
+    parser.add_argument('--compare', action='store_true', help="exit 1 on regression against the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--repeat', type=int, default=3, help="timing passes per size; the fastest counts")
+    parser.add_argument('--output', help="also write results JSON here")
+    args = parser.parse_args(argv)
+
+    # Timed before and after the stages; the faster of the two is the machine's speed now
+    reference = reference_seconds()
+    current = {}
+    for rows in args.rows:
+        current[str(rows)] = measure(rows, args.stages, args.seed, args.repeat)
+        print_results(rows, current[str(rows)])
+    reference = min(reference, reference_seconds())
+    print(f"⏱️  reference workload: {reference * 1000:.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        for size, stages in current.items():
+            baseline.setdefault(size, {}).update(stages)
+        baseline[REFERENCE_KEY] = round(reference, 4)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline saved: {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        with open(args.baseline) as f:
+            failures = compare(current, json.load(f), args.tolerance, reference)
+        for failure in failures:
+            print(f"❌ {failure}")
+        if failures:
+            return 1
+        print(f"✅ No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark alert-rule evaluation per incident with thousands of rules
+
+Rules are generated from the gazetteer: windowed district/type counts,
+state keyword mentions and region-wide counts, like the examples in
+config.yaml but many more. Classified corpus incidents are replayed in
+publication order, each evaluated as it would be when it arrives.
+
+Usage (from scripts/): PYTHONPATH=.. python -m benchmarks.bench_rules [--rules 5000] [--rows 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import make_incidents
+from processors.alert_rules import AlertRule, RuleEngine, COLUMNS
+from processors.data_processor import classify_incidents
+from processors.gazetteer import load_gazetteer
+
+TYPES = ['Terror', 'Encounter', 'Attack', 'Infiltration', None]
+KEYWORDS = ['IED', 'grenade', 'ambush', 'abduct', 'arms cache', 'convoy', 'cordon', 'LoC', 'CRPF', 'curfew']
+
+
+def make_rules(count, seed=42):
+    rng = np.random.default_rng(seed)
+    places = load_gazetteer()
+    districts = sorted({p['district'] for p in places if p['district']})
+    states = sorted({p['state'] for p in places if p['state']})
+    regions = sorted({p['region'] for p in places if p['region']})
+    rules = []
+    for i in range(count):
+        kind = rng.random()
+        incident_type = TYPES[rng.integers(len(TYPES))]
+        if kind < 0.5:
+            rules.append(AlertRule(f"rule-{i}", district=districts[rng.integers(len(districts))],
+                                   incident_type=incident_type, count=int(rng.integers(2, 6)),
+                                   window_hours=float(rng.choice([1, 6, 12, 24]))))
+        elif kind < 0.8:
+            words = rng.choice(KEYWORDS, size=int(rng.integers(1, 3)), replace=False)
+            rules.append(AlertRule(f"rule-{i}", state=states[rng.integers(len(states))], keywords=tuple(words)))
+        else:
+            rules.append(AlertRule(f"rule-{i}", region=regions[rng.integers(len(regions))],
+                                   incident_type=incident_type, count=int(rng.integers(5, 20)),
+                                   window_hours=float(rng.choice([6, 24]))))
+    return rules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alert-rule evaluation latency")
+    parser.add_argument('--rules', type=int, default=5000)
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.yaml')
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+
+    df = classify_incidents(make_incidents(args.rows, args.seed), config)
+    df['published'] = pd.to_datetime(df['published'], errors='coerce', utc=True, format='mixed')
+    df = df.dropna(subset=['published']).sort_values('published')
+    incidents = df[[col for col in COLUMNS if col in df.columns]].to_dict('records')
+
+    began = time.perf_counter()
+    engine = RuleEngine(make_rules(args.rules, args.seed))
+    build = time.perf_counter() - began
+
+    latencies, fired = [], 0
+    for incident in incidents:
+        now = incident['published'].timestamp()
+        began = time.perf_counter()
+        fired += len(engine.evaluate(incident, now))
+        latencies.append(time.perf_counter() - began)
+
+    latencies = np.array(latencies) * 1e6
+    print(f"📊 alert rules: {args.rules:,} rules x {len(incidents):,} incidents")
+    print(f"  build      : {build * 1000:8.1f} ms")
+    print(f"  per incident: mean {latencies.mean():7.1f} µs  p50 {np.percentile(latencies, 50):7.1f} µs  "
+          f"p95 {np.percentile(latencies, 95):7.1f} µs  p99 {np.percentile(latencies, 99):7.1f} µs")
+    print(f"  throughput : {len(incidents) / (latencies.sum() / 1e6):,.0f} incidents/s, {fired:,} alerts fired")
+
+
+if __name__ == "__main__":
+    main()
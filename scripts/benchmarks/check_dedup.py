@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Check that near-duplicate clustering never merges distinct incidents
+
+Three checks, exit 1 if any fails:
+  - the same story template reported from different places (Thoubal,
+    Diphu, Sunderbani, Delhi, Chennai) stays one incident per place,
+    while reworded copies of one report still collapse into one;
+  - fed through DedupStage one source per micro-batch, as iter_collected
+    releases them, the copies still collapse and the places stay apart;
+  - on the synthetic corpus, no cluster mixes rows naming different
+    places or regions, or published more than max_hours_apart apart.
+
+Usage (from scripts/): PYTHONPATH=.. python -m benchmarks.check_dedup [rows]
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pandas as pd
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import make_incidents
+from processors.data_processor import deduplicate_data
+from processors.pipeline import DedupStage
+from processors.region_matcher import get_region_matcher
+
+DETAIL = "Police said the area has been cordoned off and a search operation is underway."
+PLACES = ['Thoubal (Manipur)', 'Diphu (Assam)', 'Sunderbani (J&K)', 'Delhi', 'Chennai']
+
+
+def dedup(df, settings):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return deduplicate_data(df, None, settings.get('near_duplicate_threshold', 0.6),
+                                settings.get('num_perm', 64), settings.get('max_hours_apart', 48))
+
+
+def story_rows():
+    """Hand-written distinct-place stories and syndicated copies of one report"""
+    rows = []
+    for i, place in enumerate(PLACES):
+        title = f"IED blast reported near market in {place}"
+        rows.append({'title': title, 'description': f"{title}. {DETAIL}", 'summary': DETAIL,
+                     'source': 'RSS hindu', 'published': '2026-10-01T06:00:00Z', 'url': f"https://example.com/place/{i}"})
+    # Syndicated copies: an update note, a title-cased headline
+    variants = [('RSS toi', "Terrorists killed in encounter in Kupwara", ''),
+                ('NewsAPI', "Terrorists killed in encounter in Kupwara", ' Updated.'),
+                ('RSS india_today', "Terrorists Killed In Encounter In Kupwara", '')]
+    for i, (source, title, suffix) in enumerate(variants):
+        rows.append({'title': title, 'description': f"{title}. {DETAIL}{suffix}", 'summary': DETAIL,
+                     'source': source, 'published': f"2026-10-01T0{i}:30:00Z", 'url': f"https://example.com/copy/{i}"})
+    return pd.DataFrame(rows)
+
+
+def story_failures(out, label):
+    failures = []
+    places = [title for title in out['title'] if 'IED' in title]
+    if len(places) != len(PLACES):
+        failures.append(f"{label}: {len(PLACES)} distinct-place stories became {len(places)}")
+    copies = out[out['title'].str.contains('Kupwara')]
+    if len(copies) != 1:
+        failures.append(f"{label}: 3 reworded copies became {len(copies)} incidents")
+    return failures
+
+
+def check_places(settings):
+    """Failure messages for the hand-written distinct-place and reworded-copy stories"""
+    return story_failures(dedup(story_rows(), settings), 'one batch')
+
+
+def check_batches(settings):
+    """Same stories, one micro-batch per source through a single DedupStage"""
+    stage = DedupStage(None, settings.get('near_duplicate_threshold', 0.6), settings.get('num_perm', 64),
+                       settings.get('max_hours_apart', 48))
+    with contextlib.redirect_stdout(io.StringIO()):
+        parts = [stage(batch) for _, batch in story_rows().groupby('source', sort=False)]
+    return story_failures(pd.concat(parts, ignore_index=True), 'per-source batches')
+
+
+def check_corpus(rows, settings):
+    """Failure messages for corpus clusters mixing places, regions or distant times"""
+    df = make_incidents(rows)
+    out = dedup(df, settings)
+    matcher = get_region_matcher()
+    by_url = df.set_index('url')
+    published = pd.to_datetime(by_url['published'], errors='coerce', utc=True, format='mixed')
+    max_hours = settings.get('max_hours_apart', 48)
+
+    failures = []
+    merged = out[out['cluster_size'] > 1]
+    for urls in merged['duplicate_urls']:
+        scans = [matcher.scan(' '.join(str(v) for v in by_url.loc[url, ['title', 'description', 'text']] if v))
+                 for url in urls]
+        regions = {labels[0] for labels, _ in scans}
+        places = {mentions[0] for _, mentions in scans if mentions}
+        times = published[urls].dropna()
+        spread = (times.max() - times.min()).total_seconds() / 3600 if len(times) else 0
+        if len(regions) > 1 or len(places) > 1 or (max_hours is not None and spread > max_hours):
+            failures.append(f"cluster of {len(urls)} mixes {sorted(regions)} / {sorted(places)} over {spread:.0f}h")
+
+    print(f"📊 {rows:,} rows -> {len(out):,} incidents, {len(merged):,} near-duplicate clusters "
+          f"(largest {int(out['cluster_size'].max())})")
+    return failures
+
+
+def main(rows=5000):
+    config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.yaml')
+    with open(config_path) as f:
+        settings = yaml.safe_load(f).get('dedup', {}) or {}
+
+    failures = check_places(settings) + check_batches(settings) + check_corpus(rows, settings)
+    for failure in failures[:20]:
+        print(f"❌ {failure}")
+    if failures:
+        return 1
+    print("✅ Distinct places stay separate; reworded copies merge")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
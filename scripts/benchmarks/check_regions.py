@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Check region labels for place names that double as common words
+
+Each case is a sentence and the (region, state, district) it must get
+from the configured RegionMatcher; exit 1 if any label differs. Covers
+sentence-initial and dateline words (Along, Mon), names anchored by a
+locative or by another mention of their state, and demonyms.
+
+Usage (from scripts/): PYTHONPATH=.. python -m benchmarks.check_regions
+"""
+import os
+import sys
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processors.region_matcher import RegionMatcher
+
+JK = ('Jammu & Kashmir', 'Jammu and Kashmir')
+CASES = [
+    # Common words at the start of a sentence, heading or dateline
+    ("Along with two militants, police arrested a man in Kashmir", JK + (None,)),
+    ("Mon, 12 Oct 2026: encounter in Jammu", JK + ('Jammu',)),
+    ("Delhi: Along the border, traders protest against new rules", ('Other', None, None)),
+    ("Villagers walk along the river bank every evening", ('Other', None, None)),
+    ("Militants Move Along LoC In Kupwara", JK + ('Kupwara',)),
+    # The same names used as places
+    ("Encounter breaks out in Uri sector", JK + ('Baramulla',)),
+    ("Firing reported in Along, West Siang", ('North East', 'Arunachal Pradesh', 'West Siang')),
+    ("Police in Samba and Kathua on alert", JK + ('Samba',)),
+    ("IED found near market at Tura", ('North East', 'Meghalaya', 'West Garo Hills')),
+    # Demonyms
+    ("Kashmiri pandits hold protest in Delhi", JK + (None,)),
+    ("Assamese film-makers boycott festival", ('North East', 'Assam', None)),
+    ("Manipuri students stage sit-in", ('North East', 'Manipur', None)),
+    ("Naga groups call 48-hour bandh", ('North East', 'Nagaland', None)),
+    ("Mizo civil society seeks border fencing", ('North East', 'Mizoram', None)),
+]
+
+
+def main():
+    config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config.yaml')
+    with open(config_path) as f:
+        matcher = RegionMatcher(yaml.safe_load(f).get('regions', {}))
+
+    failures = 0
+    for text, expected in CASES:
+        got = matcher.match(text)
+        if got != expected:
+            failures += 1
+            print(f"❌ {text!r}: {got} (expected {expected})")
+    if failures:
+        return 1
+    print(f"✅ {len(CASES)} ambiguous-name and demonym cases labelled correctly")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Seeded synthetic incident corpus for benchmarks
+
+Rows look like collector output: RSS/NewsAPI headlines with summaries
+and descriptions, tweets with hashtags, places drawn from the gazetteer
+(plus places outside it and outside our regions), a mix of timestamp
+formats with some missing, and a share of exact and reworded duplicates
+so dedup has work to do.
+"""
+import numpy as np
+import pandas as pd
+
+from processors.gazetteer import load_gazetteer
+
+EVENTS = [
+    "Terrorists killed in encounter in {place}",
+    "Gunfight breaks out between militants and security forces in {place}",
+    "IED blast reported near market in {place}",
+    "Militants ambush army convoy near {place}",
+    "Ceasefire violation along LoC reported in {place}",
+    "Security forces recover arms cache in {place}",
+    "Grenade attack on CRPF camp in {place}",
+    "Insurgents abduct two traders from {place}",
+    "Chief minister inaugurates new bridge in {place}",
+    "Heavy rain lashes {place}, schools closed",
+    "Tourist footfall rises in {place} ahead of festival",
+    "{place} hosts inter-district football tournament",
+]
+DETAILS = [
+    "Police said the area has been cordoned off and a search operation is underway.",
+    "Officials confirmed the incident and said more details were awaited.",
+    "Local residents reported hearing gunshots late in the evening.",
+    "The district administration has suspended mobile internet as a precaution.",
+    "An FIR has been registered and investigation is in progress.",
+    "Traffic on the highway was halted for several hours.",
+]
+UNITS = ['personnel', 'civilians', 'suspects', 'vehicles', 'shops', 'houses', 'weapons', 'rounds']
+VERBS = ['reported', 'detained', 'injured', 'recovered', 'damaged', 'searched', 'evacuated']
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+HASHTAGS = ['#Kashmir', '#Manipur', '#Breaking', '#IndianArmy', '#Northeast', '#JammuKashmir', '#Assam']
+# Not in the gazetteer: exercises the network geocoder path
+UNKNOWN_PLACES = ['Lolab', 'Hajin', 'Dangerpora', 'Chandel Bazaar', 'Moreh Gate', 'Kakching Khunou']
+ELSEWHERE = ['Mumbai', 'Delhi', 'Chennai', 'Kolkata', 'Bengaluru', 'Pune']
+SOURCES = ['RSS hindu', 'RSS toi', 'RSS india_today', 'RSS business_standard', 'NewsAPI', 'Twitter']
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def _pick(rng, values, n):
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+
+def make_incidents(rows, seed=42, days=90, now='2026-10-01T00:00:00Z', duplicate_rate=0.1):
+    """DataFrame of `rows` synthetic incidents, identical for the same seed"""
+    rng = np.random.default_rng(seed)
+    gazetteer = [place['name'] for place in load_gazetteer()]
+    places = _pick(rng, gazetteer, rows)
+    kind = rng.choice(3, rows, p=[0.75, 0.1, 0.15])
+    places[kind == 1] = _pick(rng, UNKNOWN_PLACES, int((kind == 1).sum()))
+    places[kind == 2] = _pick(rng, ELSEWHERE, int((kind == 2).sum()))
+
+    templates = _pick(rng, EVENTS, rows)
+    titles = pd.Series([t.replace('{place}', p) for t, p in zip(templates, places)], dtype=object)
+    # Counts, units and times vary the wording so distinct stories stay distinct
+    details = pd.Series([
+        f"{a} {b} {n} {unit} were {verb} around {h}:{m:02d} hrs on {day}."
+        for a, b, n, unit, verb, h, m, day in zip(
+            _pick(rng, DETAILS, rows), _pick(rng, DETAILS, rows), rng.integers(2, 40, rows),
+            _pick(rng, UNITS, rows), _pick(rng, VERBS, rows), rng.integers(0, 24, rows),
+            rng.integers(0, 60, rows), _pick(rng, DAYS, rows))
+    ], dtype=object)
+    source = pd.Series(_pick(rng, SOURCES, rows))
+    tweet = (source == 'Twitter').to_numpy()
+
+    published = pd.Timestamp(now) - pd.to_timedelta(rng.uniform(0, days * 86400, rows), unit='s')
+    formats = rng.choice(3, rows, p=[0.6, 0.3, 0.1])
+    stamps = np.where(formats == 0, published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                      published.strftime('%a, %d %b %Y %H:%M:%S +0000')).astype(object)
+    stamps[formats == 2] = None
+
+    df = pd.DataFrame({
+        'title': titles.where(~tweet, ''),
+        'description': (titles + '. ' + details).where(~tweet, ''),
+        'summary': details.where(~tweet, ''),
+        'text': (titles + ' ' + pd.Series(_pick(rng, HASHTAGS, rows))).where(tweet, ''),
+        'source': source,
+        'published': stamps,
+        'url': [f"https://example.com/{seed}/{i}" for i in range(rows)],
+    })
+
+    # Exact copies (syndicated stories, published together) and reworded near-copies
+    copies = rng.random(rows) < duplicate_rate
+    originals = rng.integers(0, rows, int(copies.sum()))
+    df.loc[copies, ['title', 'description', 'summary', 'text', 'published']] = df.loc[
+        originals, ['title', 'description', 'summary', 'text', 'published']].to_numpy()
+    reworded = copies & (rng.random(rows) < 0.5)
+    df.loc[reworded, 'description'] = df.loc[reworded, 'description'] + ' Updated.'
+    return df
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Check the import cost of a main.py mode against a time budget
+
+Runs `python -X importtime -c "import main; main.preload(mode)"` a few
+times in fresh interpreters, reports the median total and the slowest
+top-level imports, and exits non-zero if the median exceeds the budget
+or a library the mode should never load shows up. The budget covers the
+cost above an empty interpreter (`-c pass`, i.e. site and encodings),
+measured the same way in the same run.
+
+Usage (from scripts/): PYTHONPATH=.. python -m benchmarks.import_budget [mode] [budget_ms]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Above an empty interpreter. Scrape measured ~0.59s, nearly all pandas/pyarrow, requests and
+# feedparser; main.py importing every module up front cost ~1.25s
+BUDGETS_MS = {'scrape': 600, 'backfill': 650}
+FORBIDDEN = {
+    'scrape': ['folium', 'plotly', 'geopy', 'tweepy', 'httpx', 'spacy'],
+    'backfill': ['folium', 'plotly', 'geopy', 'httpx', 'spacy'],
+}
+
+
+def measure(mode=None):
+    """(total_us, {top-level module: cumulative_us}) for one fresh interpreter; mode None imports nothing"""
+    code = f"import main; main.preload({mode!r})" if mode else 'pass'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting shows as indentation; only top-level imports add to the total
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative)
+        else:
+            modules.setdefault(name.strip(), 0)
+    return sum(v for v in modules.values()), modules
+
+
+def main(mode='scrape', budget_ms=None, runs=5):
+    budget_ms = budget_ms or BUDGETS_MS.get(mode)
+    baseline_ms = statistics.median(measure()[0] for _ in range(runs)) / 1000
+    samples = [measure(mode) for _ in range(runs)]
+    median_ms = statistics.median(total for total, _ in samples) / 1000 - baseline_ms
+    modules = samples[-1][1]
+
+    print(f"📦 import cost of main.py {mode} (median of {runs})")
+    print(f"  empty : {baseline_ms:8.1f} ms (site, encodings; not counted)")
+    print(f"  total : {median_ms:8.1f} ms" + (f" (budget {budget_ms} ms)" if budget_ms else ''))
+    for name, us in sorted(modules.items(), key=lambda item: -item[1])[:10]:
+        if us:
+            print(f"  {name:<32} {us / 1000:8.1f} ms")
+
+    failed = False
+    leaked = [name for name in FORBIDDEN.get(mode, []) if name in modules]
+    if leaked:
+        print(f"❌ {mode} imports {', '.join(leaked)}")
+        failed = True
+    if budget_ms and median_ms > budget_ms:
+        print(f"❌ over budget by {median_ms - budget_ms:.1f} ms")
+        failed = True
+    if not failed:
+        print("✅ within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'scrape'
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    sys.exit(main(mode, budget))
@@ -0,0 +1,60 @@
+"""Offline stand-ins for network backends and models used in benchmarks"""
+import re
+import time
+import zlib
+from collections import namedtuple
+
+from benchmarks.corpus import UNKNOWN_PLACES, ELSEWHERE
+from processors.geocoder import FrontierGeocoder
+from processors.location_extractor import LocationExtractor
+from utils.rate_limit import TokenBucket
+
+Location = namedtuple('Location', ['latitude', 'longitude'])
+Entity = namedtuple('Entity', ['text', 'label_'])
+Doc = namedtuple('Doc', ['ents'])
+
+
+class StubGeocoder:
+    """geopy-style geocode() with fixed latency and deterministic coordinates
+
+    Answers every query with a point inside India derived from its hash,
+    so cache behaviour matches a real backend without any network.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def geocode(self, query, timeout=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        h = zlib.crc32(query.encode())
+        return Location(8.0 + (h % 2800) / 100, 68.0 + (h // 2800 % 2900) / 100)
+
+
+class StubNER:
+    """spaCy-style nlp.pipe() tagging a fixed list of place names as GPE
+
+    Stands in for the NER fallback so the corpus's places outside the
+    gazetteer reach the geocoder's network path, as they would with a
+    real model configured.
+    """
+
+    def __init__(self, places=UNKNOWN_PLACES + ELSEWHERE):
+        self.pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, places)) + r')\b')
+
+    def pipe(self, docs, batch_size=256):
+        for doc in docs:
+            yield Doc([Entity(name, 'GPE') for name in self.pattern.findall(doc)])
+
+
+def stub_geocoder(cache_path, latency=0.0, rate=1000.0, time_budget=60):
+    """FrontierGeocoder whose only backend is a StubGeocoder, with StubNER as its NER fallback"""
+    geocoder = FrontierGeocoder(cache_path=cache_path, backends={}, time_budget=time_budget)
+    # A private extractor: the shared one must not keep the stub model
+    geocoder.extractor = LocationExtractor(ner_model='stub', matcher=geocoder.extractor.matcher)
+    geocoder.extractor._nlp = StubNER()
+    backend = StubGeocoder(latency)
+    geocoder.backends.append(('stub', backend.geocode, TokenBucket(rate, per=1.0, capacity=rate)))
+    return geocoder, backend
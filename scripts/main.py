@@ -2,24 +2,47 @@
 import os
 import sys
 import yaml
-from datetime import datetime
-import pandas as pd
+import argparse
+import importlib
+import itertools
+import threading
+from datetime import datetime, timedelta
+from functools import partial
 
 # FIX: Add parent directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import all modules
-from scrapers.news_scraper import NewsScraper
-from scrapers.rss_scraper import RSSScraper
-from scrapers.twitter_scraper import TwitterScraper
-from processors.data_processor import deduplicate_data, classify_incidents
-from processors.geocoder import FrontierGeocoder
-from analyzers.geo_analyzer import GeoAnalyzer
-from notifiers.telegram_notifier import TelegramNotifier
+# Only stdlib-weight modules at load time; each mode imports what it uses
+# inside the functions that need it, so `main.py scrape` never pays for
+# folium, plotly, geopy, tweepy or httpx.
+from utils.metrics import metrics
+
+# schedules in config.yaml -> the mode each one runs in serve mode
+SCHEDULED_MODES = {'scrape_interval': 'scrape', 'daily_report': 'full'}
+
+# Modules each mode touches; preload() imports them up front
+SCRAPE_MODULES = [
+    'scrapers.collector', 'scrapers.rss_scraper', 'scrapers.news_scraper', 'scrapers.feed_state',
+    'scrapers.feed_registry', 'processors.region_matcher', 'processors.seen_index',
+    'processors.incident', 'processors.incident_store', 'processors.stream',
+]
+MODE_MODULES = {
+    'scrape': SCRAPE_MODULES,
+    'backfill': SCRAPE_MODULES + ['scrapers.twitter_scraper', 'scrapers.backfill'],
+    'full': SCRAPE_MODULES + ['scrapers.twitter_scraper', 'processors.pipeline', 'processors.geocoder',
+                              'analyzers.geo_analyzer', 'processors.alert_rules',
+                              'notifiers.telegram_notifier'],
+}
+MODE_MODULES['serve'] = MODE_MODULES['full'] + ['utils.cron', 'utils.health']
+MODE_MODULES['query'] = ['processors.incident_store', 'analyzers.spatial_index']
+
+def preload(mode):
+    """Import everything a mode needs now rather than on first use"""
+    for name in MODE_MODULES[mode]:
+        importlib.import_module(name)
 
 def load_config():
     """Load configuration with secret substitution"""
-    import os
     config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
     with open(config_path, 'r') as f:
         config = yaml.safe_load(f)
@@ -32,132 +55,523 @@ def load_config():
     
     return config
 
-def collect_data(config):
-    """Collect data from all sources"""
-    all_incidents = []
+def open_seen_index(config):
+    """Persistent index of incidents already collected in earlier runs"""
+    from processors.seen_index import SeenIndex
+    settings = config.get('seen_index', {}) or {}
+    return SeenIndex(
+        settings.get('path', 'data/cache/seen.sqlite'),
+        capacity=settings.get('capacity', 1_000_000),
+        error_rate=settings.get('error_rate', 0.01)
+    )
+
+def open_store(config, name):
+    """Date-partitioned Parquet dataset under the configured storage root"""
+    from processors.incident_store import IncidentStore
+    settings = config.get('storage', {}) or {}
+    return IncidentStore(settings.get('root', 'data/store'), name)
+
+def open_rollup(config):
+    """Daily incident counts behind the charts, rebuilt from the store on first use"""
+    from processors.rollup import IncidentRollup
+    settings = config.get('charts', {}) or {}
+    rollup = IncidentRollup(settings.get('rollup_path', 'data/cache/rollup.sqlite'))
+    if rollup.is_empty():
+        days = rollup.rebuild(open_store(config, 'incidents'))
+        if days:
+            print(f"📈 Rebuilt chart rollup from {days} days of stored incidents")
+    return rollup
+
+def open_spatial_index(config, start=None, end=None):
+    """Space-time index over stored incidents published in [start, end]"""
+    from analyzers.spatial_index import SpatioTemporalIndex
+    settings = config.get('hotspots', {}) or {}
+    return SpatioTemporalIndex.from_store(open_store(config, 'incidents'), start, end,
+                                          cell_deg=settings.get('cell_deg', 0.25))
+
+def find_hotspots(config, now=None, start=None, end=None):
+    """Cluster stored incidents in [start, end] and save the hotspot table
+
+    The window defaults to the last window_days before end (or now);
+    emergence is judged relative to end when one is given.
+    """
+    settings = config.get('hotspots', {}) or {}
+    now = end or now or datetime.utcnow()
+    start = start or now - timedelta(days=settings.get('window_days', 7))
+    index = open_spatial_index(config, start=start, end=end)
+    hotspots = index.hotspots(
+        eps_km=settings.get('eps_km', 25),
+        eps_hours=settings.get('eps_hours', 48),
+        min_samples=settings.get('min_samples', 5),
+        recent_hours=settings.get('recent_hours', 24),
+        growth=settings.get('growth', 2.0),
+        now=now
+    )
+    output = settings.get('output', 'data/hotspots.csv')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    hotspots.to_csv(output, index=False)
+    emerging = hotspots[hotspots['emerging'].astype(bool)]
+    print(f"🔥 {len(hotspots)} hotspots in {len(index)} located incidents, {len(emerging)} emerging -> {output}")
+    for spot in emerging.head(5).itertuples():
+        place = getattr(spot, 'district', None) or getattr(spot, 'region', None) or f"{spot.lat:.2f},{spot.lon:.2f}"
+        print(f"  • {place}: {spot.recent} in the last {settings.get('recent_hours', 24)}h ({spot.size} total)")
+    return hotspots
+
+def open_rule_engine(config, now=None):
+    """Alert rules from config.yaml, their windows refilled from the store"""
+    from processors.alert_rules import RuleEngine, CooldownStore, COLUMNS
+    settings = config.get('alert_rules', {}) or {}
+    cooldowns = CooldownStore(settings.get('state_path', 'data/cache/alert_state.sqlite'))
+    engine = RuleEngine.from_config(config, cooldowns)
+    if len(engine):
+        now = now or datetime.utcnow()
+        recent = open_store(config, 'incidents').query(
+            columns=COLUMNS, start=now - timedelta(seconds=engine.max_age))
+        engine.prime(recent)
+        print(f"🔔 {len(engine)} alert rules, primed with {len(recent)} recent incidents")
+    return engine
+
+def open_feed_state(config):
+    """Conditional-GET validators and last-seen times per RSS feed"""
+    from scrapers.feed_state import FeedStateStore
+    settings = config.get('collection', {}) or {}
+    return FeedStateStore(settings.get('feed_state_path', 'data/cache/feeds.sqlite'))
+
+def iter_collected(config, hours_back=6, seen_index=None, feed_state=None, session=None):
+    """Collect from all sources concurrently, yielding new incidents as they arrive
+
+    FLUSH follows each source's items, so micro_batches releases what it
+    holds instead of waiting for a full batch.
+    """
+    from scrapers.collector import CollectionEngine
+    from scrapers.rss_scraper import RSSScraper
+    from processors.incident import Incident
+    from processors.stream import FLUSH
+    from processors.region_matcher import get_region_matcher
+    
+    settings = config.get('collection', {}) or {}
+    timeout = settings.get('timeout', 30)
+    engine = CollectionEngine(
+        max_workers=settings.get('max_workers', 16),
+        timeout=timeout,
+        session=session
+    )
+    if session is None:
+        metrics.track_session(engine.session)
+    regions = get_region_matcher(config.get('regions', {}))
     
     # NewsAPI
-    print("📰 Scraping NewsAPI...")
     if config['newsapi_key']:
-        news = NewsScraper(config['newsapi_key'])
-        news_articles = news.search_incidents()
-        relevant_news = news.filter_relevant(news_articles)
-        for article in relevant_news:
-            article['source'] = 'NewsAPI'
-            all_incidents.append(article)
+        print("📰 Scraping NewsAPI...")
+        from scrapers.news_scraper import NewsScraper
+        news = NewsScraper(config['newsapi_key'], session=engine.session, timeout=timeout,
+                           region_matcher=regions)
+        
+        def fetch_news():
+            articles = news.filter_relevant(news.search_incidents(hours_back))
+            for article in articles:
+                article['source'] = 'NewsAPI'
+            return articles
+        
+        engine.add('NewsAPI', metrics.timed_source('NewsAPI', fetch_news))
     else:
         print("⚠️  No NewsAPI key - skipping")
     
-    # RSS (no API key needed)
-    print("📰 Scraping RSS feeds...")
-    rss = RSSScraper()
-    rss_incidents = rss.scrape_feeds()
-    all_incidents.extend(rss_incidents)
+    # RSS (no API key needed) - one job per due feed, highest priority first
+    rss = RSSScraper(session=engine.session, timeout=timeout, state=feed_state, region_matcher=regions)
+    start_time = datetime.utcnow() - timedelta(hours=hours_back)
+    if feed_state is not None and (config.get('rss', {}) or {}).get('feeds'):
+        from scrapers.feed_registry import FeedRegistry
+        registry = FeedRegistry.from_config(config, feed_state)
+        due = registry.due()
+        print(f"📰 Scraping {len(due)} of {len(registry.feeds)} RSS feeds (due now)...")
+        metrics.count('rss.feeds_due', len(due))
+        for feed in due:
+            name, url = feed['name'], feed['url']
+            fetch = registry.tracked(name, partial(rss.scrape_feed, name, url, start_time))
+            engine.add(f"RSS {name}", metrics.timed_source(f"RSS {name}", fetch))
+    else:
+        print("📰 Scraping RSS feeds...")
+        for name, url in rss.feeds.items():
+            engine.add(f"RSS {name}", metrics.timed_source(f"RSS {name}", partial(rss.scrape_feed, name, url, start_time)))
     
     # Twitter
-    print("🐦 Scraping Twitter...")
     if config['twitter_bearer']:
-        twitter = TwitterScraper(config['twitter_bearer'])
-        tweets = twitter.search_tweets()
-        for tweet in tweets:
-            tweet['source'] = 'Twitter'
-            all_incidents.append(tweet)
+        print("🐦 Scraping Twitter...")
+        from scrapers.twitter_scraper import TwitterScraper
+        twitter = TwitterScraper(config['twitter_bearer'], region_matcher=regions)
+        
+        def fetch_tweets():
+            tweets = twitter.search_tweets(hours_back)
+            for tweet in tweets:
+                tweet['source'] = 'Twitter'
+            return tweets
+        
+        engine.add('Twitter', metrics.timed_source('Twitter', fetch_tweets))
     else:
         print("⚠️  No Twitter Bearer - skipping")
     
-    print(f"✅ Collected {len(all_incidents)} total incidents")
-    return pd.DataFrame(all_incidents)
+    total = 0
+    for name, items in engine.iter_results():
+        metrics.count('items.collected', len(items))
+        items = [Incident.from_dict(item) for item in items]
+        if seen_index is not None:
+            new_items = seen_index.filter_new(items)
+            print(f"  ✓ {name}: {len(new_items)} new of {len(items)} items")
+            items = new_items
+        else:
+            print(f"  ✓ {name}: {len(items)} items")
+        metrics.count('items.new', len(items))
+        total += len(items)
+        yield from items
+        yield FLUSH
+    
+    print(f"✅ Collected {total} total incidents")
+
+def iter_backlog(config, seen_index):
+    """Raw-store items from recent scrape/backfill runs that were never processed
+
+    Scrape and backfill only archive what they collect; full mode picks
+    those items up here, whether or not the sources still list them.
+    """
+    from processors.incident import Incident, FIELDS
+    days = (config.get('pipeline', {}) or {}).get('backlog_days', 7)
+    start = datetime.utcnow() - timedelta(days=days)
+    total = 0
+    for _, frame in open_store(config, 'raw').iter_partitions(columns=FIELDS, start=start):
+        items = seen_index.filter_new(Incident.from_dict(item) for item in frame.to_dict('records'))
+        total += len(items)
+        yield from items
+    print(f"📦 {total} archived incidents from the last {days} days not yet processed")
 
-def process_and_analyze(df, config):
-    """Process data and generate analysis"""
+def collect_data(config, hours_back=6, seen_index=None, feed_state=None):
+    """Collect data from all sources concurrently"""
+    from processors.incident import incident_frame
+    from processors.stream import FLUSH
+    return incident_frame(item for item in iter_collected(config, hours_back, seen_index, feed_state)
+                          if item is not FLUSH)
+
+def open_geocoder(config):
+    """Gazetteer + disk cache geocoder; network only for unknown places"""
+    from processors.geocoder import FrontierGeocoder
+    geo_settings = config.get('geocoding', {}) or {}
+    return FrontierGeocoder(
+        cache_path=geo_settings.get('cache_path', 'data/cache/geocode.sqlite'),
+        cache_ttl_days=geo_settings.get('cache_ttl_days', 90),
+        cache_max_entries=geo_settings.get('cache_max_entries', 50000),
+        backends=geo_settings.get('backends'),
+        time_budget=geo_settings.get('time_budget', 300),
+        ner_model=geo_settings.get('ner_model'),
+        regions=config.get('regions', {})
+    )
+
+def build_pipeline(config, seen_index=None, geocoder=None, raw_index=None):
+    """(Archive ->) dedup -> classify -> geocode -> compact, applied batch by batch"""
+    from processors.stream import Pipeline
+    from processors.pipeline import ArchiveStage, DedupStage, ClassifyStage, GeocodeStage, CompactStage
+    dedup = config.get('dedup', {}) or {}
+    geocoder = geocoder or open_geocoder(config)
+    archive = [] if raw_index is None else [('archive', ArchiveStage(open_store(config, 'raw'), raw_index))]
+    pipeline = Pipeline(archive + [
+        ('dedup', DedupStage(seen_index, dedup.get('near_duplicate_threshold'), dedup.get('num_perm', 64),
+                             dedup.get('max_hours_apart', 48))),
+        ('classify', ClassifyStage(config)),
+        ('geocode', GeocodeStage(geocoder, config)),
+        ('compact', CompactStage()),
+    ])
+    return pipeline, geocoder
+
+def process_and_analyze(incidents, config, seen_index=None, feed_state=None, on_batch=None, geocoder=None,
+                        raw_index=None):
+    """Stream incidents through the pipeline into the store, then analyze
+    
+    incidents is any iterable of incident dicts (or a DataFrame); it is
+    consumed in micro-batches, and on_batch(df) sees each processed batch
+    as soon as it is stored. With raw_index (the seen index's raw
+    namespace), items new to the raw archive are appended to it first.
+    """
+    from processors.stream import StoreSink, micro_batches
+    from processors.pipeline import RollupSink, FrameSink, CallbackSink
+    from analyzers.geo_analyzer import GeoAnalyzer
+    
     os.makedirs('data', exist_ok=True)
     os.makedirs('maps', exist_ok=True)
     os.makedirs('charts', exist_ok=True)
     
-    if df.empty:
-        print("⚠️  No incidents to process")
-        return df, None, {}
-    
-    # Process
     print("🔄 Processing data...")
-    df['published'] = pd.to_datetime(df['published'], errors='coerce')
-    df_processed = deduplicate_data(df.to_dict('records'))
-    df_processed = pd.DataFrame(df_processed)
+    pipeline, geocoder = build_pipeline(config, seen_index, geocoder, raw_index)
+    stats_before = dict(geocoder.stats)
+    disk_before = (geocoder.cache.hits, geocoder.cache.misses)
+    frames = FrameSink()
+    rollup = open_rollup(config)
+    sinks = [StoreSink(open_store(config, 'incidents'), seen_index, feed_state), RollupSink(rollup), frames]
+    if on_batch is not None:
+        sinks.append(CallbackSink(on_batch))
+    settings = config.get('pipeline', {}) or {}
+    batches = micro_batches(incidents, settings.get('batch_size', 500), settings.get('max_batch_wait'))
+    count = pipeline.into(batches, sinks)
     
-    if not df_processed.empty:
-        df_processed = classify_incidents(df_processed, config)
+    # A warm geocoder keeps counting across runs; report this run's share
+    stats = {k: v - stats_before[k] for k, v in geocoder.stats.items()}
+    metrics.record_cache('geocode', stats['gazetteer'] + stats['cache'], stats['network'] + stats['unresolved'])
+    metrics.record_cache('geocode_disk', geocoder.cache.hits - disk_before[0], geocoder.cache.misses - disk_before[1])
     
-    # Geocode (limit to avoid timeouts)
-    print("📍 Geocoding (first 20 incidents)...")
-    geocoder = FrontierGeocoder()
-    df_sample = df_processed.head(20).copy()
-    df_geocoded = geocoder.geocode_incidents(df_sample)
-    df_geocoded.to_csv('data/incidents.csv', index=False)
+    if not count:
+        print("⚠️  No incidents to process")
+        rollup.close()
+        return 0, None, {}
     
     # Analyze
     print("📊 Analyzing...")
-    analyzer = GeoAnalyzer(df_geocoded)
-    map_path = analyzer.create_incident_map('maps/incidents.html')
-    charts = analyzer.create_stats_charts('charts')
+    analyzer = GeoAnalyzer(frames.frame())
+    map_settings = config.get('map', {}) or {}
+    with metrics.stage('map'):
+        map_path = analyzer.create_incident_map(
+            'maps/incidents.html',
+            heatmap=map_settings.get('heatmap', True),
+            time_slider=map_settings.get('time_slider', False),
+            titles_per_point=map_settings.get('titles_per_point', 5)
+        )
+    chart_settings = config.get('charts', {}) or {}
+    with metrics.stage('charts'):
+        charts = analyzer.create_stats_charts(
+            'charts', rollup,
+            window_days=chart_settings.get('window_days', 30),
+            trend_days=chart_settings.get('trend_days', 90),
+            plotlyjs=chart_settings.get('plotlyjs', 'cdn')
+        )
+    rollup.close()
+    with metrics.stage('hotspots'):
+        find_hotspots(config)
     
-    return df_geocoded, map_path, charts
+    return count, map_path, charts
 
 def send_report(notifier, count, map_path, charts):
-    """ALTERNATIVE: Save report as GitHub ISSUE (100% works)"""
+    """Send the run summary with the map and charts attached"""
     print(f"✅ OSINT REPORT COMPLETE: {count} incidents processed!")
-    print(f"📊 Data: data/incidents.csv")
-    print(f"🗺️ Map: maps/incidents.html") 
+    print(f"📊 Data: data/store/incidents/")
+    print(f"🗺️ Map: {map_path or 'not generated'}")
     print(f"📈 Charts: charts/ folder")
     
-    # Create GitHub Issue with report summary
-    import os
-    repo_token = os.getenv('GITHUB_TOKEN', 'ghp_')  # Auto-provided
-    
-    issue_data = {
-        "title": f"FrontierWatch Report {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-        "body": f"""
-🚨 **DAILY OSINT SUMMARY** 🚨
+    try:
+        with metrics.stage('notify'):
+            sent = notifier.send_daily_report(count, map_path, charts)
+    except Exception as e:
+        print(f"⚠️  Telegram report failed: {e}")
+        return False
+    print("✅ Report sent to Telegram" if sent else "⚠️  Report not sent")
+    return sent
 
-📊 **{count} incidents** detected:
-- Jammu & Kashmir + Northeast India  
-- RSS + NewsAPI sources
-- Processed: data/incidents.csv
-- Map: maps/incidents.html
-
-**Pipeline:** ✅ LIVE & WORKING
-**Next report:** Tomorrow 8AM IST
-
-#FrontierWatch #OSINT
-        """
-    }
+def alert_batch(notifier, engine=None, incidents=True):
+    """on_batch hook queuing real-time alerts for classified incidents in our regions
     
-    print("✅ SUMMARY SAVED AS GITHUB ISSUE")
+    With a rule engine, every incident is also checked against the alert
+    rules and each rule that fires is queued as its own alert. Incidents
+    older than the engine's max_age_hours (backlog replays, late feeds)
+    are not pushed.
+    """
+    columns = ['title', 'url', 'source', 'region', 'district', 'incident_type']
+    
+    def on_batch(batch):
+        if engine is not None and len(engine):
+            with metrics.stage('alert_rules'):
+                notifier.push(engine.evaluate_batch(batch))
+        if not incidents or 'region' not in batch.columns or 'incident_type' not in batch.columns:
+            return
+        relevant = batch[(batch['region'] != 'Other') & (batch['incident_type'] != 'Other')]
+        if engine is not None:
+            relevant = engine.recent(relevant)
+        present = [col for col in columns if col in relevant.columns]
+        notifier.push(relevant[present].to_dict('records'))
+    return on_batch
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="FrontierWatch OSINT pipeline")
+    parser.add_argument('mode', nargs='?', default='full', choices=['full', 'scrape', 'backfill', 'serve', 'query'])
+    parser.add_argument('--start', help="backfill/query start (UTC), e.g. 2026-09-01")
+    parser.add_argument('--end', help="backfill/query end (UTC, exclusive); defaults to now")
+    parser.add_argument('--profile', action='store_true',
+                        help="capture cProfile/tracemalloc output per stage in data/profile/")
+    parser.add_argument('--host', help="serve: health endpoint address (default from config)")
+    parser.add_argument('--port', type=int, help="serve: health endpoint port (default from config)")
+    parser.add_argument('--near', help="query: gazetteer place or 'lat,lon', e.g. Kupwara")
+    parser.add_argument('--radius', type=float, default=25, help="query: radius in km around --near")
+    parser.add_argument('--hours', type=float, help="query: only the last N hours")
+    parser.add_argument('--bbox', help="query: min_lon,min_lat,max_lon,max_lat")
+    return parser.parse_args(argv)
 
-def main(mode='full'):
+def main(mode='full', start=None, end=None, profile=False, host=None, port=None, query_args=None):
     """Main orchestration"""
     print(f"🚀 FrontierWatch starting... ({mode} mode)")
+    metrics.reset(mode)
+    if profile:
+        metrics.enable_profiling('data/profile')
     
     config = load_config()
     print(f"✅ Config loaded: {len([k for k,v in config.items() if v])} keys")
     
+    if mode == 'serve':
+        return serve(config, host, port)
+    if mode == 'query':
+        return query(config, start=start, end=end, **(query_args or {}))
+    
+    seen_index = open_seen_index(config)
+    feed_state = open_feed_state(config)
+    try:
+        run_mode(mode, config, seen_index, feed_state, start, end)
+    finally:
+        finish_run(seen_index)
+
+def finish_run(seen_index, hits_before=0, misses_before=0, rejects_before=0):
+    """Record seen-index stats for the run and write the run report"""
+    metrics.record_cache('seen_index', seen_index.hits - hits_before, seen_index.misses - misses_before)
+    metrics.count('seen_index.bloom_rejects', seen_index.bloom_rejects - rejects_before)
+    metrics.write('data/run_report.json')
+
+def run_mode(mode, config, seen_index, feed_state, start=None, end=None, warm=None):
+    """Run one job; warm holds long-lived session/geocoder/notifier in serve mode"""
+    warm = warm or {}
+    # Scrape and backfill record what they archive under their own namespace,
+    # so full mode still processes those items (see iter_backlog)
+    raw_index = seen_index.scoped('raw')
     if mode == 'scrape':
-        df = collect_data(config)
-        if not df.empty:
-            df.to_csv('data/raw_scrape.csv', index=False)
-        print(f"✅ Scraped {len(df)} incidents")
+        from processors.stream import Pipeline, StoreSink, micro_batches
+        # Append only genuinely new items to the raw archive, batch by batch
+        settings = config.get('pipeline', {}) or {}
+        items = iter_collected(config, seen_index=raw_index, feed_state=feed_state, session=warm.get('session'))
+        batches = micro_batches(items, settings.get('batch_size', 500), settings.get('max_batch_wait'))
+        count = Pipeline([]).into(batches,
+                                  [StoreSink(open_store(config, 'raw'), raw_index, feed_state)])
+        print(f"✅ Scraped {count} new incidents")
         return
     
-    # Full analysis
-    df = collect_data(config)
-    df_final, map_path, charts = process_and_analyze(df, config)
-    
-    notifier = TelegramNotifier(
-        config['telegram_token'],
-        config['telegram_chat_id']
-    )
+    if mode == 'backfill':
+        if not start:
+            raise SystemExit("backfill needs --start")
+        from scrapers.backfill import BackfillRunner
+        end = datetime.fromisoformat(end) if end else datetime.utcnow()
+        runner = BackfillRunner(config, open_store(config, 'raw'), raw_index)
+        with metrics.stage('backfill'):
+            runner.run(datetime.fromisoformat(start), end)
+        return
     
-    send_report(notifier, len(df_final), map_path, charts)
+    # Full analysis, streamed from the collectors straight through to the sinks
+    from notifiers.telegram_notifier import TelegramNotifier
+    notifier = warm.get('notifier') or TelegramNotifier.from_config(config).start()
+    try:
+        engine = warm['engine'] if 'engine' in warm else open_rule_engine(config)
+        alerts = (config.get('telegram', {}) or {}).get('alerts', True)
+        on_batch = alert_batch(notifier, engine, alerts) if alerts or len(engine) else None
+        # Archived but unprocessed items first, then whatever the sources have that the archive lacks
+        collected = iter_collected(config, seen_index=raw_index, feed_state=feed_state, session=warm.get('session'))
+        items = itertools.chain(iter_backlog(config, seen_index), collected)
+        count, map_path, charts = process_and_analyze(items, config, seen_index, feed_state, on_batch,
+                                                      geocoder=warm.get('geocoder'), raw_index=raw_index)
+        send_report(notifier, count, map_path, charts)
+    finally:
+        if notifier is not warm.get('notifier'):
+            notifier.stop()
     print("✅ Pipeline complete!")
 
+def serve(config, host=None, port=None):
+    """Stay resident and run scrape/report jobs on the cron schedules in config.yaml
+    
+    Sessions, caches, the geocoder, the notifier, compiled matchers and
+    the alert rules' sliding windows stay warm between jobs. /health and
+    /metrics are served locally.
+    """
+    from scrapers.collector import build_session
+    from processors.region_matcher import get_region_matcher
+    from notifiers.telegram_notifier import TelegramNotifier
+    from utils.cron import CronScheduler
+    from utils.health import HealthServer
+    
+    preload('serve')
+    settings = config.get('serve', {}) or {}
+    collection = config.get('collection', {}) or {}
+    seen_index = open_seen_index(config)
+    feed_state = open_feed_state(config)
+    warm = {
+        'session': metrics.track_session(build_session(pool_size=collection.get('max_workers', 16))),
+        'geocoder': open_geocoder(config),
+        'notifier': TelegramNotifier.from_config(config).start(),
+        'engine': open_rule_engine(config),
+    }
+    get_region_matcher(config.get('regions', {}))
+    
+    def job(mode):
+        def run():
+            metrics.reset(mode)
+            before = (seen_index.hits, seen_index.misses, seen_index.bloom_rejects)
+            print(f"⏰ Running scheduled {mode} job")
+            try:
+                run_mode(mode, config, seen_index, feed_state, warm=warm)
+            finally:
+                finish_run(seen_index, *before)
+        return run
+    
+    scheduler = CronScheduler()
+    for name, expression in (config.get('schedules', {}) or {}).items():
+        if name in SCHEDULED_MODES:
+            scheduler.add(name, expression, job(SCHEDULED_MODES[name]))
+            print(f"🗓️  {name} ({SCHEDULED_MODES[name]}): '{expression}', next {scheduler.jobs[name]['next_run']:%Y-%m-%d %H:%M} UTC")
+    
+    started = datetime.utcnow()
+    worker = threading.Thread(target=scheduler.run_forever, name='scheduler', daemon=True)
+    health = HealthServer(
+        report=lambda: {
+            'started': started.isoformat() + 'Z',
+            'jobs': scheduler.status(),
+            'last_run': metrics.report(),
+        },
+        is_healthy=worker.is_alive,
+        host=host or settings.get('host', '127.0.0.1'),
+        port=port if port is not None else settings.get('port', 8080)
+    )
+    health.start()
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(timeout=1)
+    except KeyboardInterrupt:
+        print("🛑 Stopping...")
+    finally:
+        scheduler.stop()
+        worker.join()
+        health.stop()
+        warm['notifier'].stop()
+        warm['geocoder'].cache.close()
+        seen_index.close()
+
+def query(config, near=None, radius=25, hours=None, bbox=None, start=None, end=None):
+    """Print stored incidents near a place or inside a box, e.g. 25 km of Kupwara in the last 72h"""
+    from analyzers.spatial_index import resolve_point
+    end = datetime.fromisoformat(end) if end else None
+    start = datetime.fromisoformat(start) if start else None
+    if hours is not None:
+        start = (end or datetime.utcnow()) - timedelta(hours=hours)
+    if not near and not bbox:
+        return find_hotspots(config, start=start, end=end)
+    try:
+        point = resolve_point(near) if near else None
+        box = [float(v) for v in bbox.split(',')] if bbox else None
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    if box is not None and len(box) != 4:
+        raise SystemExit(f"❌ --bbox needs min_lon,min_lat,max_lon,max_lat, got {bbox!r}")
+    index = open_spatial_index(config, start=start, end=end)
+    if near:
+        results = index.radius(*point, radius)
+        print(f"📍 {len(results)} incidents within {radius:g} km of {near}")
+    else:
+        results = index.bbox(*box)
+        print(f"📍 {len(results)} incidents in [{bbox}]")
+    columns = [col for col in ['published', 'distance_km', 'district', 'incident_type', 'title']
+               if col in results.columns]
+    print(results[columns].head(50).to_string(index=False))
+    return results
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(args.mode, args.start, args.end, args.profile, args.host, args.port,
+         query_args={'near': args.near, 'radius': args.radius, 'hours': args.hours, 'bbox': args.bbox})
@@ -1,28 +1,286 @@
-import requests
+import asyncio
+import html
+import os
+import threading
 from datetime import datetime
 
+import httpx
+
+from utils.metrics import metrics
+from utils.rate_limit import TokenBucket
+
+API_URL = "https://api.telegram.org"
+MAX_MESSAGE_LENGTH = 4096
+MAX_CAPTION_LENGTH = 1024
+
+
+def format_alert(incident):
+    """One incident as an HTML Telegram message"""
+    place = ' / '.join(str(p) for p in [incident.get('region'), incident.get('district')]
+                       if isinstance(p, str) and p and p != 'Other')
+    lines = [f"🚨 <b>{html.escape(str(incident.get('incident_type') or 'Incident'))}</b>"
+             + (f" · {html.escape(place)}" if place else '')]
+    lines.append(html.escape(str(incident.get('title') or '')))
+    if incident.get('source'):
+        lines.append(f"<i>{html.escape(str(incident['source']))}</i>")
+    if isinstance(incident.get('url'), str) and incident['url']:
+        lines.append(html.escape(incident['url']))
+    return '\n'.join(lines)
+
+
+def format_digest(incidents, max_items=15):
+    """A burst of incidents coalesced into one HTML message"""
+    by_region = {}
+    for incident in incidents:
+        region = incident.get('region') or 'Other'
+        by_region[region] = by_region.get(region, 0) + 1
+    lines = [f"🚨 <b>{len(incidents)} new incidents</b>",
+             ' · '.join(f"{html.escape(str(r))}: {n}" for r, n in sorted(by_region.items(), key=lambda x: -x[1])),
+             '']
+    for incident in incidents[:max_items]:
+        kind = html.escape(str(incident.get('incident_type') or 'Incident'))
+        title = html.escape(str(incident.get('title') or '')[:120])
+        if isinstance(incident.get('url'), str) and incident['url']:
+            title = f"<a href=\"{html.escape(incident['url'])}\">{title}</a>"
+        lines.append(f"• [{kind}] {title}")
+    if len(incidents) > max_items:
+        lines.append(f"…and {len(incidents) - max_items} more")
+
+    text = '\n'.join(lines)
+    if len(text) > MAX_MESSAGE_LENGTH and max_items > 1:
+        return format_digest(incidents, max_items // 2)
+    return text
+
+
+def format_rule_alert(match):
+    """A fired alert rule (processors.alert_rules) as an HTML message"""
+    lines = [f"⚠️ <b>{html.escape(str(match['rule']))}</b>",
+             f"{html.escape(match['description'])} · {match['count']} matching", '']
+    for incident in match['incidents']:
+        title = html.escape(str(incident.get('title') or '')[:120])
+        if isinstance(incident.get('url'), str) and incident['url']:
+            title = f"<a href=\"{html.escape(incident['url'])}\">{title}</a>"
+        lines.append(f"• {title}")
+    return '\n'.join(lines)
+
+
 class TelegramNotifier:
-    def __init__(self, bot_token, chat_id):
+    """Async Telegram Bot API client for alerts, digests and report files
+
+    Every call goes through one pooled httpx.AsyncClient and one token
+    bucket sized to Telegram's per-chat limit; 429 responses are retried
+    after the retry_after Telegram asks for. Alerts that arrive within
+    digest_window seconds, or while the bucket is empty, go out as a
+    single digest; fired alert rules always get a message of their own.
+    Point api_url at a local stub server to test it.
+
+    From synchronous code, start() runs the client on a background event
+    loop, push() queues alerts and stop() drains the queue.
+    """
+
+    def __init__(self, bot_token, chat_id, api_url=API_URL, messages_per_minute=20, burst=3,
+                 digest_window=2.0, max_retries=5, timeout=30):
         self.bot_token = bot_token or "TEST_MODE"
         self.chat_id = chat_id or "1290402334"
-    
-    def send_daily_report(self, incidents_count, map_path=None, charts=None):
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        self.api_url = api_url.rstrip('/')
+        self.enabled = bool(bot_token) or self.api_url != API_URL
+        self.bucket = TokenBucket(messages_per_minute, per=60.0, capacity=burst)
+        self.digest_window = digest_window
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.client = None
+        self.queue = None
+        self.dispatcher = None
+        self.loop = None
+        self.thread = None
+
+    @classmethod
+    def from_config(cls, config):
+        settings = config.get('telegram', {}) or {}
+        return cls(
+            config.get('telegram_token'),
+            config.get('telegram_chat_id'),
+            api_url=settings.get('api_url', API_URL),
+            messages_per_minute=settings.get('messages_per_minute', 20),
+            burst=settings.get('burst', 3),
+            digest_window=settings.get('digest_window', 2.0),
+            max_retries=settings.get('max_retries', 5),
+        )
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def open(self):
+        if self.client is not None:
+            return
+        self.client = httpx.AsyncClient(
+            base_url=f"{self.api_url}/bot{self.bot_token}",
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        )
+        self.queue = asyncio.Queue()
+        self.dispatcher = asyncio.create_task(self._dispatch())
+
+    async def aclose(self):
+        """Deliver everything still queued, then close the connection pool"""
+        if self.client is None:
+            return
+        await self.queue.join()
+        self.dispatcher.cancel()
+        await asyncio.gather(self.dispatcher, return_exceptions=True)
+        await self.client.aclose()
+        self.client = None
+
+    async def call(self, method, data=None, files=None, acquired=False):
+        """POST one Bot API method and return its result
+
+        Waits on the token bucket before each attempt (unless the caller
+        already holds a token), sleeps retry_after on 429 and backs off
+        on 5xx or connection errors.
+        """
+        if not self.enabled:
+            print(f"⚠️  No Telegram token - skipping {method}")
+            return None
+        for attempt in range(self.max_retries + 1):
+            if not acquired or attempt:
+                await self.bucket.acquire_async()
+            try:
+                response = await self.client.post(f"/{method}", data=data, files=files)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                print(f"Telegram {method} error: {e} - retrying")
+                await asyncio.sleep(2 ** attempt)
+                continue
+
+            if response.status_code == 429:
+                retry_after = (response.json().get('parameters') or {}).get('retry_after', 2 ** attempt)
+                metrics.count('telegram.rate_limited')
+                print(f"⏳ Telegram asked to retry {method} after {retry_after}s")
+                await asyncio.sleep(retry_after)
+                continue
+            if response.status_code >= 500 and attempt < self.max_retries:
+                await asyncio.sleep(2 ** attempt)
+                continue
+            response.raise_for_status()
+            metrics.count(f"telegram.{method}")
+            return response.json().get('result')
+        raise RuntimeError(f"Telegram {method} failed after {self.max_retries} retries")
+
+    async def send_message(self, text, acquired=False):
+        data = {
+            'chat_id': self.chat_id,
+            'text': text[:MAX_MESSAGE_LENGTH],
+            'parse_mode': 'HTML',
+            'disable_web_page_preview': 'true',
+        }
+        return await self.call('sendMessage', data, acquired=acquired)
+
+    async def send_document(self, path, caption=None):
+        """Upload a file (map, chart) to the chat"""
+        with open(path, 'rb') as f:
+            content = f.read()
+        data = {'chat_id': self.chat_id}
+        if caption:
+            data['caption'] = caption[:MAX_CAPTION_LENGTH]
+        return await self.call('sendDocument', data, files={'document': (os.path.basename(path), content)})
+
+    async def alert(self, incident):
+        """Queue one incident (or rule match); bursts are coalesced into digests"""
+        await self.queue.put(incident)
+
+    async def flush(self):
+        await self.queue.join()
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.digest_window
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                # Whatever piles up while waiting for a token joins this message
+                await self.bucket.acquire_async()
+                while not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                rules = [item for item in batch if 'rule' in item]
+                incidents = [item for item in batch if 'rule' not in item]
+                texts = [format_rule_alert(match) for match in rules]
+                if incidents:
+                    texts.append(format_alert(incidents[0]) if len(incidents) == 1 else format_digest(incidents))
+                for i, text in enumerate(texts):
+                    await self.send_message(text, acquired=not i)
+                metrics.count('telegram.rule_alerts', len(rules))
+                metrics.count('telegram.alerts', len(incidents))
+            except Exception as e:
+                print(f"Telegram alert error: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def send_report(self, incidents_count, map_path=None, charts=None):
+        """Run summary message followed by the map and charts as documents"""
+        if self.queue is not None:
+            await self.flush()  # pending alerts go out before the summary
         message = f"""
 🚨 FrontierWatch LIVE REPORT 🚨
 🕐 {datetime.now().strftime('%Y-%m-%d %H:%M IST')}
 📊 {incidents_count} INCIDENTS DETECTED
 📍 Jammu & Kashmir + Northeast
-✅ PIPELINE WORKING 100%
 
 #OSINT #FrontierWatch
 """
-        data = {'chat_id': self.chat_id, 'text': message, 'parse_mode': 'HTML'}
-        
-        print(f"🔗 Telegram URL: {url[:50]}...")
-        print(f"👤 Chat ID: {self.chat_id}")
-        
-        r = requests.post(url, data=data)
-        print(f"📱 STATUS: {r.status_code}")
-        print(f"📱 RESPONSE: {r.text}")
-        return r.status_code == 200
+        result = await self.send_message(message)
+        attachments = [(map_path, 'Incident map')]
+        attachments += [(path, f"{name.title()} chart") for name, path in (charts or {}).items()]
+        for path, caption in attachments:
+            if path and os.path.exists(path):
+                await self.send_document(path, caption)
+        return result is not None
+
+    # Synchronous bridge
+
+    def start(self):
+        """Run the client on a background event loop for synchronous callers"""
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+            self.thread.start()
+            self._run(self.open())
+        return self
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def push(self, incidents):
+        """Queue alerts from synchronous code; needs start()"""
+        for incident in incidents:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, incident)
+
+    def stop(self):
+        if self.loop is None:
+            return
+        try:
+            self._run(self.aclose())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+            self.loop = self.thread = None
+
+    def send_daily_report(self, incidents_count, map_path=None, charts=None):
+        if self.loop is not None:
+            return self._run(self.send_report(incidents_count, map_path, charts))
+
+        async def run():
+            async with self:
+                return await self.send_report(incidents_count, map_path, charts)
+        return asyncio.run(run())
@@ -0,0 +1,294 @@
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+
+import pandas as pd
+
+from processors.keyword_matcher import SUFFIXES, TEXT_COLUMNS
+from processors.region_matcher import trie_regex
+
+# Fields a rule can pin; anything left out matches every value
+DIMENSIONS = ['region', 'state', 'district', 'incident_type']
+# Incident fields kept with each counted incident for the alert message
+SUMMARY_FIELDS = ['title', 'url', 'source']
+# Everything evaluate() reads from an incident
+COLUMNS = list(dict.fromkeys(DIMENSIONS + TEXT_COLUMNS + SUMMARY_FIELDS + ['published']))
+
+
+@dataclass(slots=True)
+class AlertRule:
+    """One rule from config.yaml's alert_rules.rules
+
+    Fires when `count` incidents matching every given dimension (and any
+    of `keywords`, if set) fall within window_hours of each other, then
+    stays quiet for cooldown_minutes.
+    """
+    name: str
+    region: str = None
+    state: str = None
+    district: str = None
+    incident_type: str = None
+    keywords: tuple = ()
+    count: int = 1
+    window_hours: float = 0
+    cooldown_minutes: float = None
+
+    def __post_init__(self):
+        self.keywords = tuple(sorted({' '.join(str(kw).lower().split()) for kw in self.keywords or ()}))
+        if self.cooldown_minutes is None:
+            self.cooldown_minutes = self.window_hours * 60 if self.count > 1 else 0
+
+    @classmethod
+    def from_config(cls, settings):
+        known = {name: settings[name] for name in cls.__dataclass_fields__ if name in settings}
+        return cls(**known)
+
+    @property
+    def key(self):
+        return tuple(getattr(self, dim) for dim in DIMENSIONS)
+
+    def describe(self):
+        scope = ' / '.join(str(v) for v in self.key[:-1] if v) or 'any place'
+        what = f"{self.incident_type or 'incident'}s" if self.count > 1 else (self.incident_type or 'incident')
+        mention = f" mentioning {', '.join(self.keywords)}" if self.keywords else ''
+        if self.count > 1:
+            return f"≥{self.count} {what}{mention} in {scope} within {self.window_hours:g}h"
+        return f"{what}{mention} in {scope}"
+
+
+class CooldownStore:
+    """quiet_until per rule name in SQLite, so a cooldown outlives the process
+
+    Scheduled full runs start a fresh engine each time while prime()
+    refills the windows from the store; without this a rule still past
+    its threshold would fire again on every run until its window drains.
+    """
+
+    def __init__(self, path='data/cache/alert_state.sqlite'):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS cooldowns (rule TEXT PRIMARY KEY, quiet_until REAL NOT NULL)")
+        self.conn.commit()
+
+    def load(self, now=None):
+        """{rule name: quiet_until} for cooldowns still running"""
+        now = time.time() if now is None else now
+        with self.lock:
+            rows = self.conn.execute("SELECT rule, quiet_until FROM cooldowns WHERE quiet_until > ?", (now,))
+            return dict(rows.fetchall())
+
+    def set(self, rule, quiet_until):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO cooldowns (rule, quiet_until) VALUES (?, ?)",
+                              (rule, quiet_until))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def _event_time(published, default):
+    """Epoch seconds of a publication time (naive means UTC), else default"""
+    if published is None or published is pd.NaT or published == '':
+        return default
+    try:
+        ts = pd.Timestamp(published)
+    except (ValueError, TypeError):
+        return default
+    return default if ts is pd.NaT else ts.timestamp()
+
+
+class SlidingCounter:
+    """Event times (sorted) of incidents matching one rule key, pruned to `span` seconds"""
+
+    __slots__ = ('span', 'times', 'incidents')
+
+    def __init__(self, span):
+        self.span = span
+        self.times = []
+        self.incidents = []
+
+    def add(self, ts, incident):
+        at = bisect_right(self.times, ts)
+        self.times.insert(at, ts)
+        self.incidents.insert(at, incident)
+        # Late arrivals are kept in order; only the far past is dropped
+        cut = bisect_left(self.times, self.times[-1] - self.span)
+        if cut:
+            del self.times[:cut]
+            del self.incidents[:cut]
+
+    def count(self, start, end):
+        return bisect_right(self.times, end) - bisect_left(self.times, start)
+
+    def between(self, start, end):
+        return self.incidents[bisect_left(self.times, start):bisect_right(self.times, end)]
+
+
+class RuleGroup:
+    """Rules sharing one key and keyword set, so they share one sliding counter"""
+
+    __slots__ = ('keywords', 'counter', 'instant', 'windows')
+
+    def __init__(self, keywords):
+        self.keywords = frozenset(keywords)
+        self.counter = None
+        self.instant = []   # (rule, description) firing on every match
+        self.windows = {}   # window seconds -> [(count, order, rule, description)], lowest count first
+
+    def add(self, rule):
+        if rule.count <= 1:
+            self.instant.append((rule, rule.describe()))
+            return
+        span = rule.window_hours * 3600
+        entries = self.windows.setdefault(span, [])
+        insort(entries, (rule.count, len(entries), rule, rule.describe()))
+        if self.counter is None or self.counter.span < span:
+            self.counter = SlidingCounter(span)
+
+
+class RuleEngine:
+    """Incremental evaluation of alert rules over the processed incident stream
+
+    Rules are indexed by their (region, state, district, incident_type)
+    key with unset fields as wildcards, so each incident costs 16 dict
+    lookups however many rules there are. Keywords from every rule share
+    one compiled regex, run only when a candidate rule needs it. Rules
+    with the same key and keywords share a sliding counter, counted once
+    per distinct window; nothing rescans earlier incidents.
+    """
+
+    def __init__(self, rules, max_age_hours=24, cooldowns=None):
+        self.rules = list(rules)
+        # Older incidents (backfill, late feeds) are ignored, but never ones a window still covers
+        self.max_age = max([max_age_hours * 3600] + [rule.window_hours * 3600 for rule in self.rules])
+        self.max_age_hours = max_age_hours
+        self.index = {}
+        # A CooldownStore carries cooldowns over from earlier runs
+        self.cooldowns = cooldowns
+        self.quiet_until = cooldowns.load() if cooldowns is not None else {}
+        groups = {}
+        for rule in self.rules:
+            group = groups.get((rule.key, rule.keywords))
+            if group is None:
+                group = groups[(rule.key, rule.keywords)] = RuleGroup(rule.keywords)
+                self.index.setdefault(rule.key, []).append(group)
+            group.add(rule)
+
+        keywords = {kw for rule in self.rules for kw in rule.keywords}
+        self.pattern = None
+        if keywords:
+            self.pattern = re.compile(rf"\b({trie_regex(keywords)}){SUFFIXES}\b")
+
+    @classmethod
+    def from_config(cls, config, cooldowns=None):
+        settings = config.get('alert_rules', {}) or {}
+        rules = [AlertRule.from_config(rule) for rule in settings.get('rules') or []]
+        return cls(rules, settings.get('max_age_hours', 24), cooldowns)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def _candidates(self, incident):
+        values = []
+        for dim in DIMENSIONS:
+            value = incident.get(dim)
+            values.append((value, None) if isinstance(value, str) and value else (None,))
+        found = []
+        for key in itertools.product(*values):
+            groups = self.index.get(key)
+            if groups:
+                found.extend(groups)
+        return found
+
+    def _keywords(self, incident):
+        text = ' '.join(str(incident.get(col)) for col in TEXT_COLUMNS
+                        if isinstance(incident.get(col), str) and incident.get(col))
+        return {m.group(1) for m in self.pattern.finditer(text.lower())}
+
+    def _fire(self, rule, description, recent, now):
+        if now < self.quiet_until.get(rule.name, float('-inf')):
+            return None
+        self.quiet_until[rule.name] = now + rule.cooldown_minutes * 60
+        if self.cooldowns is not None and rule.cooldown_minutes:
+            self.cooldowns.set(rule.name, self.quiet_until[rule.name])
+        return {
+            'rule': rule.name,
+            'description': description,
+            'count': len(recent),
+            'incidents': recent[-5:],
+        }
+
+    def evaluate(self, incident, now=None, fire=True):
+        """Rule matches triggered by one new incident (a dict or Incident)"""
+        now = time.time() if now is None else now
+        ts = _event_time(incident.get('published'), None)
+        if ts is None:
+            # Undated: "now" for a live incident, but a stored one has no place in a window
+            if not fire:
+                return []
+            ts = now
+        if ts < now - self.max_age:
+            return []
+        candidates = self._candidates(incident)
+        if not candidates:
+            return []
+
+        found = None
+        summary = {col: incident.get(col) for col in SUMMARY_FIELDS}
+        matches = []
+        for group in candidates:
+            if group.keywords:
+                if found is None:
+                    found = self._keywords(incident)
+                if found.isdisjoint(group.keywords):
+                    continue
+            if group.counter is not None:
+                group.counter.add(ts, summary)
+            if not fire:
+                continue
+            for rule, description in group.instant:
+                match = self._fire(rule, description, [summary], now)
+                if match:
+                    matches.append(match)
+            for span, entries in group.windows.items():
+                start = ts - span
+                seen = group.counter.count(start, ts)
+                if seen < entries[0][0]:
+                    continue
+                recent = group.counter.between(start, ts)
+                for count, _, rule, description in entries:
+                    if count > seen:
+                        break
+                    match = self._fire(rule, description, recent, now)
+                    if match:
+                        matches.append(match)
+        return matches
+
+    def evaluate_batch(self, batch, now=None, fire=True):
+        """Matches for every row of a processed batch, in order"""
+        columns = [col for col in COLUMNS if col in batch.columns]
+        matches = []
+        for incident in batch[columns].to_dict('records'):
+            matches.extend(self.evaluate(incident, now, fire))
+        return matches
+
+    def recent(self, batch, now=None):
+        """Rows of batch published within max_age_hours (undated rows count as new)"""
+        if 'published' not in batch.columns:
+            return batch
+        now = time.time() if now is None else now
+        times = batch['published'].map(lambda published: _event_time(published, now))
+        return batch[times >= now - self.max_age_hours * 3600]
+
+    def prime(self, frame, now=None):
+        """Fill the sliding counters from stored incidents without firing; undated rows are skipped"""
+        if frame is not None and not frame.empty:
+            self.evaluate_batch(frame, now, fire=False)
@@ -1,15 +1,27 @@
 import pandas as pd
-import hashlib
-import os
-import yaml
-from pathlib import Path
 
-def deduplicate_data(all_incidents):
-    """Deduplicate incidents - PRODUCTION READY"""
-    if not all_incidents:
+from processors.keyword_matcher import get_keyword_matcher, combine_text
+from processors.region_matcher import get_region_matcher
+from processors.seen_index import content_hash
+from processors.near_dedup import cluster_near_duplicates
+from processors.incident_store import IncidentStore
+
+def deduplicate_data(all_incidents, seen_index=None, near_duplicate_threshold=None, num_perm=64, max_hours=48,
+                     near_index=None):
+    """Deduplicate incidents within the batch and against the seen index
+
+    all_incidents is a list of incident dicts or a DataFrame. With
+    near_duplicate_threshold set, reworded copies of the same story are
+    also clustered into one canonical incident (MinHash/LSH), as long
+    as they name the same place and were published within max_hours.
+    A NearDuplicateIndex (near_index) extends that across batches.
+    """
+    if isinstance(all_incidents, pd.DataFrame):
+        df = all_incidents.copy()
+    elif not all_incidents:
         return pd.DataFrame()
-    
-    df = pd.DataFrame(all_incidents)
+    else:
+        df = pd.DataFrame(all_incidents)
     if df.empty:
         return df
     
@@ -20,27 +32,26 @@ def deduplicate_data(all_incidents):
         if col not in df.columns:
             df[col] = ''
     
-    # Build content ROW-BY-ROW
-    def get_content(row):
-        content = []
-        for col in ['title', 'description', 'text', 'summary']:
-            val = row.get(col, '')
-            if pd.notna(val) and val:
-                content.append(str(val))
-        return ' '.join(content)
-    
-    df['content'] = df.apply(get_content, axis=1)
-    df['content_hash'] = df['content'].apply(
-        lambda x: hashlib.md5(str(x).encode()).hexdigest()
-    )
+    # The one joined copy of the text; classify and geocode reuse it
+    df['content'] = combine_text(df)
+    df['content_hash'] = [content_hash(content) for content in df['content'].tolist()]
     
     # FIXED: Use na_position instead of na_last
     if 'published' in df.columns:
-        df['published'] = pd.to_datetime(df['published'], errors='coerce')
+        df['published'] = pd.to_datetime(df['published'], errors='coerce', utc=True, format='mixed')
         df = df.sort_values('published', ascending=False, na_position='last')
     
     before_count = len(df)
     df_unique = df.drop_duplicates(subset=['content_hash'], keep='first')
+    if near_duplicate_threshold:
+        df_unique = cluster_near_duplicates(df_unique, near_duplicate_threshold, num_perm,
+                                            max_hours=max_hours, index=near_index)
+    if seen_index is not None and not df_unique.empty:
+        seen = [
+            seen_index.is_seen({'url': url, 'content_hash': digest})
+            for url, digest in zip(df_unique.get('url', [''] * len(df_unique)), df_unique['content_hash'])
+        ]
+        df_unique = df_unique[[not s for s in seen]]
     print(f"✅ Deduplicated: {before_count} → {len(df_unique)} incidents")
     return df_unique
 
@@ -50,37 +61,45 @@ def classify_incidents(df, config):
         return df
     
     df = df.copy()
-    df['incident_type'] = 'Other'
-    df['region'] = 'Other'
-    
-    def get_full_text(row):
-        text = []
-        for col in ['title', 'description', 'text', 'summary']:
-            val = row.get(col, '')
-            if pd.notna(val) and val:
-                text.append(str(val))
-        return ' '.join(text).lower()
+    text = df['content'] if 'content' in df.columns else combine_text(df)
     
-    df['full_text'] = df.apply(get_full_text, axis=1)
+    regions = get_region_matcher(config.get('regions', {}))
+    labels = regions.label(text)
+    for col in labels.columns:
+        df[col] = labels[col]
     
-    keywords = config.get('keywords', {})
-    terror_kws = keywords.get('terror', [])
-    encounter_kws = keywords.get('encounter', [])
-    attack_kws = keywords.get('attack', [])
+    matcher = get_keyword_matcher(config.get('keywords', {}))
+    hits = matcher.hit_counts(text)
+    df['incident_type'] = matcher.classify(hits)
+    for name in matcher.categories:
+        df[f'hits_{name}'] = hits[name]
     
-    for idx, row in df.iterrows():
-        text = row['full_text']
-        if any(kw in text for kw in terror_kws):
-            df.at[idx, 'incident_type'] = 'Terror'
-        elif any(kw in text for kw in encounter_kws):
-            df.at[idx, 'incident_type'] = 'Encounter'
-        elif any(kw in text for kw in attack_kws):
-            df.at[idx, 'incident_type'] = 'Attack'
+    return df
+
+def verify_regions(df, config):
+    """Cross-check text regions against the configured bboxes
+
+    Geocoded points inside a region's bbox fill in rows the text left as
+    'Other'; region_in_bbox flags whether the point agrees with the label.
+    """
+    if df.empty or 'lat' not in df.columns:
+        return df
+    regions = get_region_matcher(config.get('regions', {}))
+    located = df['lat'].notna() & df['lon'].notna()
+    boxed = pd.Series(regions.bbox_regions(df['lat'].fillna(0), df['lon'].fillna(0)), index=df.index)
+    boxed[~located] = 'Other'
     
+    df = df.copy()
+    if 'region' not in df.columns:
+        df['region'] = 'Other'
+    unlabeled = df['region'].isna() | (df['region'] == 'Other')
+    df.loc[unlabeled & (boxed != 'Other'), 'region'] = boxed
+    df['region_in_bbox'] = (boxed == df['region']) & located
     return df
 
-def save_incidents(df, filename='../data/incidents.csv'):
-    """Save processed incidents"""
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    df.to_csv(filename, index=False)
-    print(f"💾 Saved {len(df)} incidents to {filename}")
+def save_incidents(df, store=None):
+    """Append processed incidents to the date-partitioned store"""
+    store = store or IncidentStore('../data/store', 'incidents')
+    count = store.append(df)
+    print(f"💾 Saved {count} incidents to {store.path}")
+    return count
@@ -0,0 +1,39 @@
+import csv
+import os
+from functools import lru_cache
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'gazetteer.csv')
+
+
+class Gazetteer:
+    """Bundled J&K/Northeast places checked before any network lookup"""
+
+    def __init__(self, path=GAZETTEER_PATH):
+        self.places = []
+        self.index = {}
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                row['lat'] = float(row['lat'])
+                row['lon'] = float(row['lon'])
+                row['aliases'] = [a for a in (row.get('aliases') or '').split('|') if a]
+                self.places.append(row)
+                for name in [row['name']] + row['aliases']:
+                    self.index.setdefault(name.lower(), row)
+
+    def lookup(self, name):
+        """Return the place dict for a name or alias, or None"""
+        if not name:
+            return None
+        return self.index.get(str(name).split(',')[0].strip().lower())
+
+    def __len__(self):
+        return len(self.places)
+
+    def __iter__(self):
+        return iter(self.places)
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path=GAZETTEER_PATH):
+    """Load the gazetteer once per process"""
+    return Gazetteer(path)
@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class GeocodeCache:
+    """Persistent SQLite geocode cache with TTL and size-bounded eviction"""
+
+    def __init__(self, path='data/cache/geocode.sqlite', ttl_days=90,
+                 negative_ttl_days=7, max_entries=50000):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.negative_ttl = negative_ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocode (
+                query TEXT PRIMARY KEY,
+                lat REAL,
+                lon REAL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_geocode_last_used ON geocode(last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def _key(query):
+        return ' '.join(str(query).lower().split())
+
+    def get(self, query):
+        """Return (found, (lat, lon) or None); expired rows count as misses
+
+        A cached miss (lat NULL) is returned as found with None, so failed
+        lookups are not retried until the shorter negative TTL passes.
+        """
+        key = self._key(query)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT lat, lon, created FROM geocode WHERE query = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+
+            lat, lon, created = row
+            ttl = self.ttl if lat is not None else self.negative_ttl
+            if now - created > ttl:
+                self.conn.execute("DELETE FROM geocode WHERE query = ?", (key,))
+                self.misses += 1
+                return False, None
+
+            self.conn.execute("UPDATE geocode SET last_used = ? WHERE query = ?", (now, key))
+            self.hits += 1
+        return True, (lat, lon) if lat is not None else None
+
+    def put(self, query, coords):
+        """Store (lat, lon) for a query; pass None to cache a failed lookup"""
+        lat, lon = coords if coords else (None, None)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO geocode (query, lat, lon, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (self._key(query), lat, lon, now, now)
+            )
+
+    def evict(self):
+        """Drop least-recently-used rows beyond max_entries"""
+        with self.lock:
+            count = self.conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self.conn.execute("""
+                    DELETE FROM geocode WHERE query IN (
+                        SELECT query FROM geocode ORDER BY last_used ASC LIMIT ?
+                    )
+                """, (excess,))
+        return max(excess, 0)
+
+    def flush(self):
+        """Evict overflow and persist pending writes"""
+        self.evict()
+        with self.lock:
+            self.conn.commit()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
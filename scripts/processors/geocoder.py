@@ -1,52 +1,167 @@
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
 import pandas as pd
+import queue
+import threading
 import time
 
+from processors.gazetteer import load_gazetteer
+from processors.geocache import GeocodeCache
+from processors.location_extractor import get_location_extractor
+from utils.rate_limit import TokenBucket
+
+# Requests per second per backend; Nominatim's usage policy caps it at 1
+DEFAULT_BACKENDS = {'nominatim': 1.0}
+
 class FrontierGeocoder:
-    def __init__(self):
-        self.geolocator = Nominatim(user_agent="FrontierWatch/1.0")
-        self.geocode = RateLimiter(self.geolocator.geocode, min_delay_seconds=1)
+    def __init__(self, cache_path='data/cache/geocode.sqlite', cache_ttl_days=90,
+                 cache_max_entries=50000, backends=None, time_budget=300, ner_model=None,
+                 regions=None):
+        self.gazetteer = load_gazetteer()
+        self.extractor = get_location_extractor(ner_model, regions)
+        self.cache = GeocodeCache(cache_path, ttl_days=cache_ttl_days,
+                                  max_entries=cache_max_entries)
+        self.time_budget = time_budget
+        self.stats = {'gazetteer': 0, 'cache': 0, 'network': 0, 'unresolved': 0}
+        
+        self.backends = []
+        backends = DEFAULT_BACKENDS if backends is None else backends
+        if backends:
+            from geopy.geocoders import get_geocoder_for_service
+        for name, rate in backends.items():
+            try:
+                geolocator = get_geocoder_for_service(name)(user_agent="FrontierWatch/1.0")
+            except Exception as e:
+                print(f"Geocoder backend {name} unavailable: {e}")
+                continue
+            self.backends.append((name, geolocator.geocode, TokenBucket(rate, per=1.0, capacity=1)))
     
-    def geocode_incidents(self, df):
-        """Add coordinates to incidents"""
+    def geocode_incidents(self, df, on_result=None, time_budget=None):
+        """Add coordinates to incidents
+        
+        The location is the most specific place mentioned anywhere in the
+        text (all mentions are kept in 'places', reused from
+        classify_incidents when it already ran). Each distinct location
+        is resolved once and broadcast back to all rows;
+        on_result(location, coords) is called as each one resolves.
+        time_budget overrides the configured network budget for this call.
+        """
         if df.empty:
             return df
         
-        coords = []
-        for idx, row in df.iterrows():
-            location = self._extract_location(row)
-            if location:
-                try:
-                    result = self.geocode(location + ", India")
-                    if result:
-                        coords.append({
-                            'lat': result.latitude,
-                            'lon': result.longitude,
-                            'location': location
-                        })
-                    else:
-                        coords.append({'lat': None, 'lon': None, 'location': location})
-                except:
-                    coords.append({'lat': None, 'lon': None, 'location': location})
-            else:
-                coords.append({'lat': None, 'lon': None, 'location': None})
-            
-            time.sleep(1.2)  # Rate limiting
+        mentions = self.extractor.extract(df, text=df['content'] if 'content' in df.columns else None,
+                                          places=df['places'] if 'places' in df.columns else None)
+        locations = [names[0] if names else None for names in mentions]
         
-        geo_df = pd.DataFrame(coords)
+        lats, lons = {}, {}
+        for location, result in self.resolve_many(locations, time_budget):
+            if result:
+                lats[location], lons[location] = result
+            if on_result:
+                on_result(location, result)
+        self.cache.flush()
+        
+        location_series = pd.Series(locations, dtype=object)
+        geo_df = pd.DataFrame({
+            'lat': location_series.map(lats).astype(float),
+            'lon': location_series.map(lons).astype(float),
+            'location': location_series,
+            'places': ['|'.join(names) for names in mentions]
+        })
+        df = df.drop(columns=[col for col in geo_df.columns if col in df.columns])
         return pd.concat([df.reset_index(drop=True), geo_df], axis=1)
     
-    def _extract_location(self, row):
-        """Extract location from incident text"""
-        locations = [
-            'Jammu', 'Srinagar', 'Kupwara', 'Baramulla', 'Anantnag',
-            'Imphal', 'Kohima', 'Guwahati', 'Aizawl', 'Agartala',
-            'Shillong', 'Itanagar', 'Manipur', 'Nagaland', 'Assam'
+    def resolve(self, location):
+        """Resolve a single place name (gazetteer, cache, then network)"""
+        for _, result in self.resolve_many([location]):
+            return result
+        return None
+    
+    def resolve_many(self, locations, time_budget=None):
+        """Yield (location, coords) for each distinct location as it resolves
+        
+        Gazetteer and cache hits are yielded immediately. The rest are
+        shared across all backends in parallel, each held to its own rate
+        budget, until the time budget runs out; anything still pending
+        then yields None and is retried on a later run.
+        """
+        pending = []
+        for location in dict.fromkeys(loc for loc in locations if loc):
+            origin, result = self._resolve_local(location)
+            if origin:
+                self.stats[origin] += 1
+                yield location, result
+            else:
+                pending.append(location)
+        
+        if not pending:
+            return
+        if not self.backends:
+            self.stats['unresolved'] += len(pending)
+            for location in pending:
+                yield location, None
+            return
+        
+        budget = self.time_budget if time_budget is None else time_budget
+        deadline = time.monotonic() + budget
+        work = queue.Queue()
+        for location in pending:
+            work.put(location)
+        results = queue.Queue()
+        
+        workers = [
+            threading.Thread(target=self._remote_worker, args=(backend, work, results, deadline), daemon=True)
+            for backend in self.backends
         ]
+        for worker in workers:
+            worker.start()
         
-        text = (str(row['title']) + ' ' + str(row['description'] or '')).lower()
-        for loc in locations:
-            if loc.lower() in text:
-                return loc
-        return None
+        resolved = set()
+        while len(resolved) < len(pending):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 and not any(w.is_alive() for w in workers) and results.empty():
+                break
+            try:
+                location, result = results.get(timeout=max(remaining, 0.05))
+            except queue.Empty:
+                if remaining <= 0:
+                    break
+                continue
+            resolved.add(location)
+            self.stats['network'] += 1
+            yield location, result
+        
+        skipped = [loc for loc in pending if loc not in resolved]
+        if skipped:
+            print(f"⏱️  Geocode budget spent - {len(skipped)} locations left for next run")
+        self.stats['unresolved'] += len(skipped)
+        for location in skipped:
+            yield location, None
+    
+    def _resolve_local(self, location):
+        """Return ('gazetteer' | 'cache' | None, coords)"""
+        place = self.gazetteer.lookup(location)
+        if place:
+            return 'gazetteer', (place['lat'], place['lon'])
+        found, result = self.cache.get(location + ", India")
+        return ('cache' if found else None), result
+    
+    def _remote_worker(self, backend, work, results, deadline):
+        name, geocode, bucket = backend
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not bucket.acquire(timeout=remaining):
+                return
+            try:
+                location = work.get_nowait()
+            except queue.Empty:
+                return
+            query = location + ", India"
+            try:
+                hit = geocode(query, timeout=10)
+            except Exception as e:
+                # Transient failure: report unresolved but do not cache it
+                print(f"Geocode error ({name}) for {location}: {e}")
+                results.put((location, None))
+                continue
+            result = (hit.latitude, hit.longitude) if hit else None
+            self.cache.put(query, result)
+            results.put((location, result))
@@ -0,0 +1,74 @@
+"""Compact incident records and frames
+
+Collected items travel as slotted Incident records instead of dicts,
+with their low-cardinality strings interned so every item from a feed
+shares one 'source' and 'region' object. In DataFrames, 'content' (built
+once in deduplicate_data) is the only joined copy of the text; classify
+and geocode read it instead of building their own, and compact_frame
+drops it and turns low-cardinality columns into categoricals before
+batches reach the sinks.
+
+Measured per 100k synthetic incidents (benchmarks/bench_memory.py):
+  records : dicts 96.5 MB -> Incident 74.0 MB (-23%)
+  frame   : with content + full_text 208.6 MB -> compacted 86.9 MB (-58%)
+"""
+import sys
+from dataclasses import dataclass, fields
+
+import pandas as pd
+
+# Low-cardinality columns kept as pandas categoricals
+CATEGORICAL_COLUMNS = ['source', 'region', 'state', 'district', 'incident_type', 'location']
+# Derived columns that only live while a batch is being processed
+BUFFER_COLUMNS = ['content', 'full_text']
+
+
+@dataclass(slots=True)
+class Incident:
+    """One collected item; unknown keys from scrapers are dropped"""
+    title: str = ''
+    description: str = ''
+    text: str = ''
+    summary: str = ''
+    url: str = ''
+    published: str = ''
+    source: str = 'Unknown'
+    region: str = 'Other'
+
+    def __post_init__(self):
+        self.source = sys.intern(str(self.source or 'Unknown'))
+        self.region = sys.intern(str(self.region or 'Other'))
+
+    @classmethod
+    def from_dict(cls, item):
+        if isinstance(item, cls):
+            return item
+        return cls(**{name: item[name] for name in FIELDS if item.get(name) is not None})
+
+    def get(self, key, default=None):
+        """dict-style access, so SeenIndex and friends take either form"""
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+
+FIELDS = [f.name for f in fields(Incident)]
+
+
+def incident_frame(items):
+    """DataFrame from Incident records (or dicts), one column list per field"""
+    records = [Incident.from_dict(item) for item in items]
+    if not records:
+        return pd.DataFrame(columns=FIELDS)
+    frame = pd.DataFrame({name: [getattr(r, name) for r in records] for name in FIELDS})
+    return compact_frame(frame)
+
+
+def compact_frame(df):
+    """Drop per-batch text buffers and categorize low-cardinality columns"""
+    df = df.drop(columns=[col for col in BUFFER_COLUMNS if col in df.columns])
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
@@ -0,0 +1,136 @@
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+CATEGORICAL_COLUMNS = ['region', 'incident_type', 'source']
+PARTITION_PREFIX = 'date='
+
+
+def _normalize(df):
+    """Typed copy of an incident frame ready for Parquet"""
+    df = df.copy()
+    if 'published' in df.columns:
+        df['published'] = pd.to_datetime(df['published'], errors='coerce', utc=True, format='mixed')
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('string').astype('category')
+    for col in df.columns:
+        # In-memory categoricals (state, district, ...) stay plain strings on disk,
+        # so files from different runs keep unifying
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and col not in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype('string')
+        elif df[col].dtype == object:
+            sample = df[col].dropna()
+            if sample.empty or not isinstance(sample.iloc[0], (list, tuple)):
+                df[col] = df[col].astype('string')
+    return df
+
+
+def _as_utc(value):
+    ts = pd.Timestamp(value)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+
+
+def _as_date(value):
+    if value is None:
+        return None
+    return _as_utc(value).strftime('%Y-%m-%d')
+
+
+class IncidentStore:
+    """Append-only incident dataset, partitioned by publication date
+
+    Each run writes one Parquet file per touched date partition
+    (date=YYYY-MM-DD/part-<run>.parquet). Queries prune partitions by
+    directory name and read only the requested columns.
+    """
+
+    def __init__(self, root='data/store', name='incidents'):
+        self.path = os.path.join(root, name)
+
+    def append(self, df, run_id=None):
+        """Write a batch of incidents; returns the number of rows stored"""
+        if df is None or df.empty:
+            return 0
+        run_id = run_id or f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        df = _normalize(df)
+
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        if 'published' in df.columns:
+            dates = df['published'].dt.strftime('%Y-%m-%d').fillna(today)
+        else:
+            dates = pd.Series(today, index=df.index)
+
+        for date, part in df.groupby(dates.values, sort=False):
+            part_dir = os.path.join(self.path, f"{PARTITION_PREFIX}{date}")
+            os.makedirs(part_dir, exist_ok=True)
+            table = pa.Table.from_pandas(part.reset_index(drop=True), preserve_index=False)
+            pq.write_table(table, os.path.join(part_dir, f"part-{run_id}.parquet"))
+        return len(df)
+
+    def partitions(self, start=None, end=None):
+        """Partition dates on disk, optionally limited to [start, end]"""
+        if not os.path.isdir(self.path):
+            return []
+        start, end = _as_date(start), _as_date(end)
+        dates = []
+        for entry in sorted(os.listdir(self.path)):
+            if not entry.startswith(PARTITION_PREFIX):
+                continue
+            date = entry[len(PARTITION_PREFIX):]
+            if (start is None or date >= start) and (end is None or date <= end):
+                dates.append(date)
+        return dates
+
+    def _files(self, date):
+        part_dir = os.path.join(self.path, f"{PARTITION_PREFIX}{date}")
+        return [os.path.join(part_dir, f) for f in sorted(os.listdir(part_dir)) if f.endswith('.parquet')]
+
+    def iter_partitions(self, columns=None, start=None, end=None):
+        """Yield (date, DataFrame) one partition at a time, rows unfiltered"""
+        import pyarrow.dataset as ds  # reads only; scrape mode just appends
+        for date in self.partitions(start, end):
+            files = self._files(date)
+            if not files:
+                continue
+            schema = pa.unify_schemas([pq.read_schema(f) for f in files], promote_options='permissive')
+            cols = None if columns is None else [col for col in columns if col in schema.names]
+            yield date, ds.dataset(files, schema=schema, format='parquet').to_table(columns=cols).to_pandas()
+
+    def query(self, columns=None, start=None, end=None, filter=None):
+        """Load incidents published in [start, end] as a DataFrame
+
+        Only partitions in the date range are opened and only the
+        requested columns are read. filter is an optional extra
+        pyarrow.compute expression, e.g. pc.field('region') == 'North East'.
+        """
+        import pyarrow.dataset as ds
+        files = []
+        for date in self.partitions(start, end):
+            files.extend(self._files(date))
+        if not files:
+            return pd.DataFrame(columns=columns or [])
+
+        # Runs may carry different columns; read footers only to unify them
+        schema = pa.unify_schemas([pq.read_schema(f) for f in files], promote_options='permissive')
+        dataset = ds.dataset(files, schema=schema, format='parquet')
+
+        expression = filter
+        if 'published' in schema.names:
+            ts_type = schema.field('published').type
+            if start is not None:
+                bound = pc.field('published') >= pa.scalar(_as_utc(start), type=ts_type)
+                expression = bound if expression is None else expression & bound
+            if end is not None:
+                bound = pc.field('published') <= pa.scalar(_as_utc(end), type=ts_type)
+                expression = bound if expression is None else expression & bound
+
+        if columns is not None:
+            columns = [col for col in columns if col in schema.names]
+        table = dataset.to_table(columns=columns, filter=expression)
+        return table.to_pandas()
@@ -0,0 +1,79 @@
+import re
+import numpy as np
+import pandas as pd
+
+TEXT_COLUMNS = ['title', 'description', 'text', 'summary']
+
+# Common inflections, so "attacked", "militants" and "bombing" still match
+SUFFIXES = r'(?:s|es|ed|ing)?'
+
+_matchers = {}
+
+
+class KeywordMatcher:
+    """One compiled alternation regex over every keyword category
+
+    Each category becomes a named group inside a single word-bounded
+    alternation, so one scan per document yields hits for all categories.
+    Text is lowercased once up front instead of matching with IGNORECASE.
+    """
+
+    def __init__(self, categories):
+        self.categories = [name for name, kws in categories.items() if kws]
+
+        alternatives = []
+        for i, name in enumerate(self.categories):
+            kws = sorted({kw.lower() for kw in categories[name]}, key=len, reverse=True)
+            alternatives.append(f"(?P<c{i}>{'|'.join(re.escape(kw) for kw in kws)})")
+
+        self.pattern = None
+        if alternatives:
+            # Cheap first-character lookahead skips most word starts
+            firsts = ''.join(sorted({re.escape(kw.lower()[0]) for name in self.categories
+                                     for kw in categories[name]}))
+            self.pattern = re.compile(
+                rf"\b(?=[{firsts}])(?:{'|'.join(alternatives)}){SUFFIXES}\b"
+            )
+
+    def hit_counts(self, text):
+        """Per-category keyword hit matrix (rows x categories) for a Series"""
+        counts = np.zeros((len(text), len(self.categories)), dtype=np.int32)
+        if self.pattern is not None and len(text):
+            finditer = self.pattern.finditer
+            rows, cols = [], []
+            for row, doc in enumerate(text.fillna('').astype(str).str.lower().tolist()):
+                for match in finditer(doc):
+                    rows.append(row)
+                    cols.append(match.lastindex - 1)
+            np.add.at(counts, (rows, cols), 1)
+        return pd.DataFrame(counts, index=text.index, columns=self.categories)
+
+    def classify(self, counts, default='Other'):
+        """Label each row with the first category (config order) that hit"""
+        if counts.empty or not self.categories:
+            return pd.Series(default, index=counts.index)
+        conditions = [counts[name].to_numpy() > 0 for name in self.categories]
+        labels = [name.title() for name in self.categories]
+        return pd.Series(np.select(conditions, labels, default=default), index=counts.index)
+
+
+def get_keyword_matcher(categories):
+    """Compile once per keyword configuration and reuse"""
+    key = tuple((name, tuple(kws or [])) for name, kws in categories.items())
+    if key not in _matchers:
+        _matchers[key] = KeywordMatcher(categories)
+    return _matchers[key]
+
+
+def combine_text(df, columns=TEXT_COLUMNS):
+    """Join the non-empty text columns of each row with single spaces
+
+    Matches seen_index.item_content, so the result doubles as the
+    content that incidents are hashed on.
+    """
+    present = [col for col in columns if col in df.columns]
+    if not present:
+        return pd.Series('', index=df.index)
+    values = zip(*(df[col].tolist() for col in present))
+    return pd.Series([' '.join(str(v) for v in row if v and v == v) for row in values],
+                     index=df.index, dtype=object)
@@ -0,0 +1,90 @@
+import json
+
+import pandas as pd
+
+from processors.keyword_matcher import combine_text, TEXT_COLUMNS
+from processors.region_matcher import get_region_matcher, RegionMatcher
+
+# spaCy entity labels that name places
+NER_LABELS = {'GPE', 'LOC', 'FAC'}
+
+_extractors = {}
+
+
+class LocationExtractor:
+    """Every gazetteer place mentioned in incident text, most specific first
+
+    Mentions come from the shared RegionMatcher scan, the same single
+    pass classify_incidents makes for region labels; rows it has already
+    labelled pass their 'places' in and are not scanned again. Names
+    that double as common words (Uri, Punch) must be capitalized.
+    Documents with no gazetteer mention can fall back to spaCy NER
+    (batched through nlp.pipe) when a model is configured and spaCy is
+    installed; those names go on to the geocoder's network path.
+    """
+
+    def __init__(self, gazetteer=None, ner_model=None, matcher=None):
+        self.matcher = matcher or (RegionMatcher(gazetteer=gazetteer) if gazetteer else get_region_matcher())
+        self.ner_model = ner_model
+        self._nlp = None
+
+    def mentions(self, text):
+        """Place names in one document, ranked by specificity, then frequency, then position"""
+        return self.matcher.scan(text)[1]
+
+    def extract(self, df, columns=TEXT_COLUMNS, text=None, places=None):
+        """Ranked mentions per row of a DataFrame, NER filling rows the gazetteer missed
+
+        places is classify_incidents' '|'-joined 'places' column, reused
+        as is; otherwise text is the already-joined document per row
+        (deduplicate_data's 'content'), and without it the columns are
+        joined here.
+        """
+        docs = None
+        if places is not None:
+            mentions = [value.split('|') if isinstance(value, str) and value else [] for value in places.tolist()]
+        else:
+            docs = (combine_text(df, columns) if text is None else text.fillna('').astype(str)).tolist()
+            mentions = [self.mentions(doc) for doc in docs]
+        missing = [i for i, found in enumerate(mentions) if not found]
+        if missing and self.ner_model:
+            if docs is None:
+                docs = (combine_text(df, columns) if text is None else text.fillna('').astype(str)).tolist()
+            missing = [i for i in missing if docs[i]]
+            for i, names in zip(missing, self._ner([docs[i] for i in missing])):
+                mentions[i] = names
+        return pd.Series(mentions, index=df.index, dtype=object)
+
+    def best(self, df, columns=TEXT_COLUMNS):
+        """Most specific mention per row, or None"""
+        return self.extract(df, columns).map(lambda names: names[0] if names else None)
+
+    def _ner(self, docs, batch_size=256):
+        nlp = self._load_ner()
+        if nlp is None:
+            return [[] for _ in docs]
+        results = []
+        for doc in nlp.pipe(docs, batch_size=batch_size):
+            names = dict.fromkeys(ent.text.strip() for ent in doc.ents if ent.label_ in NER_LABELS)
+            results.append([name for name in names if name])
+        return results
+
+    def _load_ner(self):
+        if self._nlp is None:
+            try:
+                import spacy
+                # Only the entity recognizer is needed
+                self._nlp = spacy.load(self.ner_model, disable=['parser', 'lemmatizer', 'textcat'])
+            except (ImportError, OSError) as e:
+                print(f"⚠️  NER fallback disabled ({self.ner_model}): {e}")
+                self.ner_model = None
+                return None
+        return self._nlp
+
+
+def get_location_extractor(ner_model=None, regions=None):
+    """One extractor per NER model and region config, sharing classify's compiled matcher"""
+    key = (ner_model, json.dumps(regions or {}, sort_keys=True))
+    if key not in _extractors:
+        _extractors[key] = LocationExtractor(ner_model=ner_model, matcher=get_region_matcher(regions))
+    return _extractors[key]
@@ -0,0 +1,252 @@
+import re
+import zlib
+import numpy as np
+import pandas as pd
+
+from processors.region_matcher import get_region_matcher
+
+MERSENNE_PRIME = (1 << 31) - 1
+TOKEN_RE = re.compile(r"[a-z0-9&]+")
+STOPWORDS = {
+    'a', 'an', 'the', 'in', 'on', 'at', 'of', 'to', 'for', 'and', 'or', 'by',
+    'with', 'from', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'has',
+    'have', 'had', 'after', 'near', 'into', 'over', 'amid', 'says', 'said'
+}
+
+
+def _choose_bands(num_perm, threshold):
+    """Pick (bands, rows) whose LSH S-curve crosses closest to threshold"""
+    best = (1, num_perm)
+    best_err = float('inf')
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        err = abs((1 / bands) ** (1 / rows) - threshold)
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+
+class MinHashLSH:
+    """MinHash signatures + banded LSH for near-duplicate grouping
+
+    Documents are reduced to word n-gram shingles (3 words by default, so
+    one template filled in with different places or numbers does not
+    look alike), hashed into num_perm MinHash values, and split into
+    bands; only documents sharing a band bucket are ever compared, which
+    keeps clustering sub-quadratic.
+    """
+
+    def __init__(self, threshold=0.6, num_perm=64, shingle_size=3, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        tokens = [t for t in TOKEN_RE.findall(str(text).lower()) if t not in STOPWORDS]
+        k = self.shingle_size
+        if k > 1 and len(tokens) >= k:
+            tokens = [' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)]
+        return {zlib.crc32(t.encode()) % MERSENNE_PRIME for t in tokens}
+
+    def signatures(self, texts, chunk_tokens=200_000):
+        """MinHash signature matrix (docs x num_perm), computed in chunks"""
+        shingle_sets = [self.shingles(t) for t in texts]
+        sigs = np.full((len(shingle_sets), self.num_perm), MERSENNE_PRIME, dtype=np.uint64)
+
+        start = 0
+        while start < len(shingle_sets):
+            end, total = start, 0
+            while end < len(shingle_sets) and (total == 0 or total + len(shingle_sets[end]) <= chunk_tokens):
+                total += len(shingle_sets[end])
+                end += 1
+
+            lengths = np.array([len(s) for s in shingle_sets[start:end]])
+            if total:
+                values = np.fromiter(
+                    (h for s in shingle_sets[start:end] for h in s), dtype=np.uint64, count=total
+                )
+                hashed = (values[:, None] * self.a + self.b) % MERSENNE_PRIME
+                nonempty = np.flatnonzero(lengths)
+                offsets = np.concatenate(([0], np.cumsum(lengths[nonempty])[:-1]))
+                sigs[start + nonempty] = np.minimum.reduceat(hashed, offsets, axis=0)
+            start = end
+        return sigs
+
+    def band_keys(self, sigs):
+        """Bucket id per (document, band), unique across bands"""
+        keys = np.empty((len(sigs), self.bands), dtype=np.int64)
+        for band in range(self.bands):
+            block = np.ascontiguousarray(sigs[:, band * self.rows:(band + 1) * self.rows])
+            values = block.view(np.dtype((np.void, block.dtype.itemsize * self.rows))).ravel()
+            _, keys[:, band] = np.unique(values, return_inverse=True)
+        return keys + np.arange(self.bands, dtype=np.int64) * len(sigs)
+
+    def band_hashes(self, sig):
+        """(band, bucket bytes) keys for one signature, stable across batches"""
+        return [(band, sig[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def cluster(self, texts, can_merge=None, sigs=None):
+        """Cluster label per document; near-duplicates share a label
+
+        Documents are taken in order and each joins the most similar
+        earlier cluster whose representative (its first document) it
+        shares a band with and matches at threshold, never a cluster it
+        only resembles through another member, so stories cannot chain
+        together. can_merge(i, rep) can veto a join.
+        """
+        n = len(texts)
+        labels = np.arange(n)
+        if n < 2:
+            return labels
+
+        sigs = self.signatures(texts) if sigs is None else sigs
+        keys = self.band_keys(sigs)
+        # Only documents sharing some bucket with another can join anything
+        counts = np.bincount(keys.ravel(), minlength=n * self.bands)
+        shared = (counts[keys] > 1).any(axis=1) & (sigs[:, 0] != MERSENNE_PRIME)
+
+        representatives = {}
+        for i in np.flatnonzero(shared).tolist():
+            row_keys = keys[i].tolist()
+            candidates = sorted({rep for key in row_keys for rep in representatives.get(key, ())})
+            best, best_similarity = None, self.threshold
+            for rep in candidates:
+                similarity = float((sigs[i] == sigs[rep]).mean())
+                if similarity < self.threshold or (best is not None and similarity <= best_similarity):
+                    continue
+                if can_merge is None or can_merge(i, rep):
+                    best, best_similarity = rep, similarity
+            if best is None:
+                for key in row_keys:
+                    representatives.setdefault(key, []).append(i)
+            else:
+                labels[i] = best
+        return labels
+
+
+def _compatible(time_a, key_a, time_b, key_b, max_hours):
+    """Same region, same place when both name one, published within max_hours"""
+    if max_hours is not None and abs(time_a - time_b) > max_hours * 3600:
+        return False
+    (region_a, place_a), (region_b, place_b) = key_a, key_b
+    return region_a == region_b and (place_a is None or place_b is None or place_a == place_b)
+
+
+class NearDuplicateIndex:
+    """Cluster representatives kept across the micro-batches of one run
+
+    Each batch is clustered on its own first; a batch cluster whose
+    representative matches one from an earlier batch (same LSH bucket,
+    threshold similarity, same region/place, within max_hours) is a late
+    copy of a story already emitted, so it is dropped and its URLs and
+    content hashes collected in `absorbed` for the caller to mark seen.
+    """
+
+    def __init__(self, threshold=0.6, num_perm=64, shingle_size=3, max_hours=48):
+        self.lsh = MinHashLSH(threshold=threshold, num_perm=num_perm, shingle_size=shingle_size)
+        self.max_hours = max_hours
+        self.buckets = {}
+        self.reps = []  # (signature, time, (region, place))
+        self.absorbed = []
+
+    def __len__(self):
+        return len(self.reps)
+
+    def match(self, sig, time, key):
+        """Earlier representative this one duplicates, or None"""
+        candidates = {rep for bucket in self.lsh.band_hashes(sig) for rep in self.buckets.get(bucket, ())}
+        best, best_similarity = None, self.lsh.threshold
+        for rep in sorted(candidates):
+            rep_sig, rep_time, rep_key = self.reps[rep]
+            similarity = float((sig == rep_sig).mean())
+            if similarity >= best_similarity and _compatible(time, key, rep_time, rep_key, self.max_hours):
+                best, best_similarity = rep, similarity
+        return best
+
+    def add(self, sig, time, key):
+        for bucket in self.lsh.band_hashes(sig):
+            self.buckets.setdefault(bucket, []).append(len(self.reps))
+        self.reps.append((sig, time, key))
+
+
+def cluster_near_duplicates(df, threshold=0.6, num_perm=64, shingle_size=3, text_col='content', max_hours=48,
+                            index=None):
+    """Collapse near-duplicate stories into one canonical incident each
+
+    Reports only merge when they name the same region and (if both name
+    one) the same most specific gazetteer place, and were published
+    within max_hours of each other, so one template reused for events
+    in different places stays separate. The canonical row is the most
+    complete report in its cluster; it gains corroborating_sources,
+    cluster_size and the URLs/hashes it absorbed. With a
+    NearDuplicateIndex, clusters duplicating an earlier batch's story
+    are dropped (see NearDuplicateIndex) and the rest join the index.
+    """
+    if df.empty:
+        return df
+
+    if index is not None:
+        lsh, max_hours = index.lsh, index.max_hours
+    else:
+        lsh = MinHashLSH(threshold=threshold, num_perm=num_perm, shingle_size=shingle_size)
+    texts = df[text_col].fillna('').astype(str).tolist()
+
+    times = np.full(len(df), np.nan)
+    if 'published' in df.columns:
+        published = pd.to_datetime(df['published'], errors='coerce', utc=True, format='mixed')
+        times = ((published - pd.Timestamp(0, tz='UTC')).dt.total_seconds()).to_numpy()
+    matcher = get_region_matcher()
+    places = {}
+
+    def place(pos):
+        if pos not in places:
+            (region, _, _), mentions = matcher.scan(texts[pos])
+            places[pos] = (region, mentions[0] if mentions else None)
+        return places[pos]
+
+    def can_merge(i, rep):
+        return _compatible(times[i], place(i), times[rep], place(rep), max_hours)
+
+    sigs = lsh.signatures(texts)
+    clusters = {}
+    for pos, label in enumerate(lsh.cluster(texts, can_merge, sigs).tolist()):
+        clusters.setdefault(label, []).append(pos)
+
+    sources = df['source'].tolist() if 'source' in df.columns else [None] * len(df)
+    urls = df['url'].tolist() if 'url' in df.columns else [None] * len(df)
+    hashes = df['content_hash'].tolist() if 'content_hash' in df.columns else [None] * len(df)
+
+    if index is not None:
+        fresh = {}
+        for label, members in clusters.items():
+            # Empty documents have no signature to match on
+            if sigs[label, 0] != MERSENNE_PRIME and index.match(sigs[label], times[label], place(label)) is not None:
+                index.absorbed.extend({'url': urls[pos], 'content_hash': hashes[pos]} for pos in members)
+                continue
+            if sigs[label, 0] != MERSENNE_PRIME:
+                index.add(sigs[label], times[label], place(label))
+            fresh[label] = members
+        clusters = fresh
+        if not clusters:
+            return df.iloc[:0]
+
+    canonical_pos, corroborating, cluster_urls, cluster_hashes = [], [], [], []
+    for members in clusters.values():
+        canonical_pos.append(max(members, key=lambda pos: len(texts[pos])))
+        corroborating.append(sorted({str(sources[pos]) for pos in members if isinstance(sources[pos], str)}))
+        cluster_urls.append([urls[pos] for pos in members if isinstance(urls[pos], str) and urls[pos]])
+        cluster_hashes.append([hashes[pos] for pos in members if hashes[pos]])
+
+    canonical = df.iloc[canonical_pos].copy()
+    canonical['cluster_size'] = [len(members) for members in clusters.values()]
+    canonical['corroborating_sources'] = corroborating
+    canonical['duplicate_urls'] = cluster_urls
+    canonical['duplicate_hashes'] = cluster_hashes
+    return canonical
@@ -0,0 +1,152 @@
+import time
+
+import pandas as pd
+
+from processors.data_processor import deduplicate_data, classify_incidents, verify_regions
+from processors.incident import compact_frame
+from processors.near_dedup import NearDuplicateIndex
+from utils.metrics import metrics
+
+# Columns the map and charts need; everything else is dropped once stored
+ANALYSIS_COLUMNS = ['lat', 'lon', 'title', 'source', 'incident_type', 'region', 'published', 'url']
+
+
+class ArchiveStage:
+    """First stage in full mode: append newly collected items to the raw archive
+
+    Rows the raw namespace of the seen index already holds (drained from
+    the raw store, or archived earlier) pass through untouched, so the
+    archive stays complete whichever mode collected an item.
+    """
+
+    def __init__(self, store, seen_index):
+        self.store = store
+        self.seen_index = seen_index
+
+    def __call__(self, batch):
+        records = batch.to_dict('records')
+        fresh = [not self.seen_index.is_seen(record) for record in records]
+        if any(fresh):
+            self.store.append(batch[fresh])
+            self.seen_index.add([record for record, new in zip(records, fresh) if new])
+            self.seen_index.flush()
+        return batch
+
+
+class DedupStage:
+    """Exact and near-duplicate removal within a batch and across the run
+
+    Exact hashes and near-duplicate cluster representatives both persist
+    across batches, so the same story reported by different sources is
+    merged even when their items arrive in different micro-batches.
+    """
+
+    def __init__(self, seen_index=None, near_duplicate_threshold=None, num_perm=64, max_hours=48):
+        self.seen_index = seen_index
+        self.threshold = near_duplicate_threshold
+        self.num_perm = num_perm
+        self.max_hours = max_hours
+        self.hashes = set()
+        self.near = (NearDuplicateIndex(near_duplicate_threshold, num_perm, max_hours=max_hours)
+                     if near_duplicate_threshold else None)
+
+    def __call__(self, batch):
+        batch = deduplicate_data(batch, self.seen_index, self.threshold, self.num_perm, self.max_hours, self.near)
+        if self.near is not None and self.near.absorbed:
+            # Late copies of stories already stored: remember them like the stored ones
+            metrics.count('items.late_duplicates', len(self.near.absorbed))
+            if self.seen_index is not None:
+                self.seen_index.add(self.near.absorbed)
+            self.near.absorbed = []
+        if batch.empty:
+            return batch
+        fresh = ~batch['content_hash'].isin(self.hashes)
+        self.hashes.update(batch['content_hash'])
+        metrics.count('items.deduplicated', int(fresh.sum()))
+        return batch[fresh]
+
+
+class ClassifyStage:
+    def __init__(self, config):
+        self.config = config
+
+    def __call__(self, batch):
+        return classify_incidents(batch, self.config)
+
+
+class GeocodeStage:
+    """Geocode each batch, sharing one network time budget across the run"""
+
+    def __init__(self, geocoder, config):
+        self.geocoder = geocoder
+        self.config = config
+        self.deadline = None
+
+    def __call__(self, batch):
+        if self.deadline is None:
+            self.deadline = time.monotonic() + self.geocoder.time_budget
+        remaining = max(0.0, self.deadline - time.monotonic())
+        batch = self.geocoder.geocode_incidents(batch, time_budget=remaining)
+        metrics.count('items.geocoded', int(batch['lat'].notna().sum()) if 'lat' in batch else 0)
+        return verify_regions(batch, self.config)
+
+
+class CompactStage:
+    """Last stage: drop the joined-text buffer and categorize repeated strings"""
+
+    def __call__(self, batch):
+        return compact_frame(batch)
+
+
+class RollupSink:
+    """Fold each batch into the daily IncidentRollup"""
+
+    def __init__(self, rollup):
+        self.rollup = rollup
+
+    def consume(self, batch):
+        with metrics.stage('rollup'):
+            self.rollup.add(batch)
+            self.rollup.flush()
+
+    def close(self, ok=True):
+        pass
+
+
+class FrameSink:
+    """Keep a slim copy of every batch for end-of-run analysis"""
+
+    def __init__(self, columns=ANALYSIS_COLUMNS):
+        self.columns = columns
+        self.parts = []
+
+    def consume(self, batch):
+        present = [col for col in self.columns if col in batch.columns]
+        part = batch[present].copy()
+        if 'title' in part.columns:
+            part['title'] = part['title'].astype(str).str.slice(0, 100)
+        self.parts.append(part)
+
+    def close(self, ok=True):
+        pass
+
+    def frame(self):
+        if not self.parts:
+            return pd.DataFrame(columns=self.columns)
+        # Batches carry different category sets, so concat falls back to object
+        return compact_frame(pd.concat(self.parts, ignore_index=True))
+
+
+class CallbackSink:
+    """Hand each batch to a callback as soon as it is processed, e.g. alerts"""
+
+    def __init__(self, on_batch, on_close=None):
+        self.on_batch = on_batch
+        self.on_close = on_close
+
+    def consume(self, batch):
+        self.on_batch(batch)
+
+    def close(self, ok=True):
+        if self.on_close:
+            self.on_close()
@@ -0,0 +1,204 @@
+import json
+import re
+import numpy as np
+import pandas as pd
+
+from processors.gazetteer import load_gazetteer
+
+# Place names that are also everyday words (or weekday abbreviations). They only count
+# when capitalized, not at the start of a sentence, heading or dateline, and either
+# right after a locative word ("in Uri") or alongside another mention of their state
+CASE_SENSITIVE = {'along', 'mon', 'punch', 'samba', 'tura', 'uri'}
+LOCATIVES = {'in', 'at', 'near', 'from', 'of', 'to', 'towards', 'outside', 'around', 'across'}
+PREVIOUS_WORD_RE = re.compile(r"([a-z]+)\W*$")
+# Demonyms name a state without naming a place on the map
+DEMONYMS = {
+    'Kashmiri': 'Jammu and Kashmir', 'Kashmiris': 'Jammu and Kashmir',
+    'Assamese': 'Assam', 'Bodo': 'Assam', 'Bodos': 'Assam',
+    'Manipuri': 'Manipur', 'Manipuris': 'Manipur', 'Meitei': 'Manipur', 'Meiteis': 'Manipur',
+    'Kuki': 'Manipur', 'Kukis': 'Manipur',
+    'Naga': 'Nagaland', 'Nagas': 'Nagaland',
+    'Mizo': 'Mizoram', 'Mizos': 'Mizoram',
+    'Tripuri': 'Tripura', 'Tripuris': 'Tripura',
+    'Khasi': 'Meghalaya', 'Garo': 'Meghalaya', 'Meghalayan': 'Meghalaya',
+    'Arunachali': 'Arunachal Pradesh', 'Arunachalis': 'Arunachal Pradesh',
+}
+
+# How specific a mention is: a district or town beats a state beats a region keyword
+RANK = {'region': 0, 'state': 1, 'district': 2, 'town': 2, 'village': 2}
+# How precise a mention is as a point on the map: village/town > district > state
+PLACE_RANK = {'village': 3, 'town': 3, 'district': 2, 'state': 1}
+
+_matchers = {}
+
+
+def trie_regex(terms):
+    """Prefix-factored alternation over terms, e.g. kup(?:wara|wad)
+
+    The regex engine then walks a trie instead of retrying every name at
+    each position, so the cost of a scan barely grows with the number of
+    names. Longer terms are preferred; word boundaries go outside.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie)
+
+
+class RegionMatcher:
+    """One compiled trie regex over every region keyword and gazetteer place
+
+    Config region keywords, per-state lists and all gazetteer names and
+    aliases go into a single word-bounded, prefix-factored pattern, so one
+    scan per document yields region, state and district along with every
+    gazetteer place mentioned (ranked for the geocoder). The most specific
+    mention wins; ties go to the region mentioned most often, then the
+    earliest. Names that double as common words (Uri, Along, Mon) need
+    more evidence, see CASE_SENSITIVE; demonyms (Kashmiri, Naga) count as
+    state mentions.
+    """
+
+    def __init__(self, regions=None, gazetteer=None):
+        gazetteer = gazetteer or load_gazetteer()
+        # term -> (region, state, district, rank, place name, place rank)
+        self.terms = {}
+        for place in gazetteer:
+            info = (place['region'], place['state'], place['district'] or None, RANK[place['kind']],
+                    place['name'], PLACE_RANK.get(place['kind'], 0))
+            for name in [place['name']] + place['aliases']:
+                self._add_term(name, info)
+            if place['kind'] == 'state':
+                for demonym, state in DEMONYMS.items():
+                    if state == place['name']:
+                        self._add_term(demonym, (place['region'], state, None, RANK['state'], None, 0))
+
+        self.labels, self.boxes = [], []
+        for key, settings in (regions or {}).items():
+            settings = settings if isinstance(settings, dict) else {'keywords': settings}
+            label = self._region_label(key, settings)
+            for name, words in settings.items():
+                if name == 'bbox' or not isinstance(words, list):
+                    continue
+                state = None if name == 'keywords' else words[0]
+                for word in words:
+                    self._add_term(word, (label, state, None, RANK['state'] if state else RANK['region'], None, 0))
+            if settings.get('bbox'):
+                self.labels.append(label)
+                self.boxes.append(settings['bbox'])
+        self.boxes = np.array(self.boxes, dtype=float).reshape(-1, 4)
+
+        self.pattern = None
+        if self.terms:
+            # Text is lowercased once; a first-character lookahead skips most word starts
+            firsts = ''.join(sorted({re.escape(t[0]) for t in self.terms}))
+            self.pattern = re.compile(rf"\b(?=[{firsts}]){trie_regex(self.terms)}\b")
+
+    def _add_term(self, name, info):
+        term = ' '.join(str(name).lower().split())
+        if term and (term not in self.terms or info[3] > self.terms[term][3]):
+            self.terms[term] = info
+
+    def _region_label(self, key, settings):
+        """Name a config region after the gazetteer region its keywords belong to"""
+        for name, words in settings.items():
+            if name == 'bbox' or not isinstance(words, list):
+                continue
+            for word in words:
+                info = self.terms.get(' '.join(str(word).lower().split()))
+                if info:
+                    return info[0]
+        return key.replace('_', ' ').title()
+
+    def scan(self, text, default='Other'):
+        """((region, state, district), ranked place mentions) for one document
+
+        Places are gazetteer names, most precise first, then most
+        frequent, then earliest.
+        """
+        if self.pattern is None or not isinstance(text, str) or not text:
+            return (default, None, None), []
+        lowered = text.lower()
+        cased = len(lowered) == len(text)
+        found, ambiguous = [], []
+        for m in self.pattern.finditer(lowered):
+            term = m.group(0)
+            if term not in CASE_SENSITIVE:
+                found.append((self.terms[term], m.start()))
+            elif cased and text[m.start()].isupper():
+                before = lowered[:m.start()].rstrip()
+                # Start of text, sentence, heading ("Delhi: Along ...") or dateline ("Mon, 12 Oct")
+                if before and before[-1] not in '.!?:;|"\'\n-–—(' and not re.match(r",\s*\d", text[m.end():]):
+                    previous = PREVIOUS_WORD_RE.search(before)
+                    ambiguous.append((self.terms[term], m.start(), bool(previous) and previous.group(1) in LOCATIVES))
+        if ambiguous:
+            states = {info[1] for info, _ in found if info[1]}
+            found += [(info, start) for info, start, located in ambiguous if located or info[1] in states]
+            found.sort(key=lambda item: item[1])
+
+        mentions, places = [], {}
+        for info, start in found:
+            mentions.append(info)
+            if info[4]:
+                entry = places.setdefault(info[4], [info[5], 0, start])
+                entry[1] += 1
+        if not mentions:
+            return (default, None, None), []
+
+        votes = {}
+        for info in mentions:
+            votes[info[0]] = votes.get(info[0], 0) + 1
+        best = mentions[0]
+        for info in mentions[1:]:
+            if (info[3], votes[info[0]]) > (best[3], votes[best[0]]):
+                best = info
+        state = best[1] or next((m[1] for m in mentions if m[0] == best[0] and m[1]), None)
+        ranked = sorted(places, key=lambda name: (-places[name][0], -places[name][1], places[name][2]))
+        return (best[0], state, best[2]), ranked
+
+    def match(self, text, default='Other'):
+        """(region, state, district) for one document"""
+        return self.scan(text, default)[0]
+
+    def classify(self, text, default='Other'):
+        """Region label for one document"""
+        return self.match(text, default)[0]
+
+    def label(self, text, default='Other'):
+        """region/state/district columns plus '|'-joined ranked 'places' for a Series of documents"""
+        rows = []
+        for doc in text.fillna('').astype(str).tolist():
+            labels, places = self.scan(doc, default)
+            rows.append(labels + ('|'.join(places),))
+        return pd.DataFrame(rows, index=text.index, columns=['region', 'state', 'district', 'places'])
+
+    def bbox_regions(self, lat, lon, default='Other'):
+        """Region whose configured bbox holds each point, vectorized over arrays"""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        if not len(self.labels):
+            return np.full(lat.shape, default, dtype=object)
+        # bbox is [min_lon, min_lat, max_lon, max_lat]
+        inside = ((lon[:, None] >= self.boxes[:, 0]) & (lat[:, None] >= self.boxes[:, 1])
+                  & (lon[:, None] <= self.boxes[:, 2]) & (lat[:, None] <= self.boxes[:, 3]))
+        labels = np.array(self.labels + [default], dtype=object)
+        first = np.where(inside.any(axis=1), inside.argmax(axis=1), len(self.labels))
+        return labels[first]
+
+
+def get_region_matcher(regions=None):
+    """Compile once per region configuration and reuse"""
+    key = json.dumps(regions or {}, sort_keys=True)
+    if key not in _matchers:
+        _matchers[key] = RegionMatcher(regions)
+    return _matchers[key]
@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+DIMENSIONS = ['day', 'region', 'incident_type', 'source']
+DEFAULTS = {'region': 'Other', 'incident_type': 'Other', 'source': 'Unknown'}
+
+
+def rollup_counts(df, default_day=None):
+    """Incident counts per day x region x incident_type x source for a frame
+
+    Rows without a publication date count on default_day (today, as in
+    the store's partitioning).
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=DIMENSIONS + ['count'])
+    today = default_day or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    if 'published' in df.columns:
+        day = pd.to_datetime(df['published'], errors='coerce', utc=True, format='mixed').dt.strftime('%Y-%m-%d')
+        day = day.fillna(today)
+    else:
+        day = pd.Series(today, index=df.index)
+    keys = {'day': day.to_numpy()}
+    for col, default in DEFAULTS.items():
+        values = df[col].astype(object) if col in df.columns else pd.Series(default, index=df.index)
+        keys[col] = values.where(values.notna() & (values != ''), default).astype(str).to_numpy()
+    return pd.DataFrame(keys).value_counts(sort=False).reset_index(name='count')
+
+
+class IncidentRollup:
+    """Incrementally maintained daily incident counts in SQLite
+
+    Each batch is reduced to (day, region, incident_type, source) counts and
+    upserted, so charts and trend reports read a table whose size grows
+    with days x categories, not with the number of incidents.
+    """
+
+    def __init__(self, path='data/cache/rollup.sqlite'):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_counts (
+                day TEXT NOT NULL,
+                region TEXT NOT NULL,
+                incident_type TEXT NOT NULL,
+                source TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (day, region, incident_type, source)
+            )
+        """)
+        self.conn.commit()
+
+    def add(self, df, default_day=None):
+        """Fold a batch of incidents into the rollup; returns rows upserted"""
+        counts = rollup_counts(df, default_day)
+        if counts.empty:
+            return 0
+        rows = [tuple(row[:4]) + (int(row[4]),) for row in counts.itertuples(index=False)]
+        with self.lock:
+            self.conn.executemany("""
+                INSERT INTO daily_counts (day, region, incident_type, source, count)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (day, region, incident_type, source)
+                DO UPDATE SET count = count + excluded.count
+            """, rows)
+        return len(rows)
+
+    def flush(self):
+        with self.lock:
+            self.conn.commit()
+
+    def is_empty(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM daily_counts LIMIT 1").fetchone() is None
+
+    def rebuild(self, store):
+        """Recount everything from an IncidentStore, one date partition at a time"""
+        with self.lock:
+            self.conn.execute("DELETE FROM daily_counts")
+        days = 0
+        for date, df in store.iter_partitions(columns=['published'] + list(DEFAULTS)):
+            self.add(df, default_day=date)
+            days += 1
+        self.flush()
+        return days
+
+    def query(self, start=None, end=None):
+        """Rollup rows with day in [start, end] (YYYY-MM-DD strings or dates)"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("day >= ?")
+            params.append(str(start)[:10])
+        if end is not None:
+            clauses.append("day <= ?")
+            params.append(str(end)[:10])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT day, region, incident_type, source, count FROM daily_counts {where}", params
+            ).fetchall()
+        return pd.DataFrame(rows, columns=DIMENSIONS + ['count'])
+
+    def recent(self, days, today=None):
+        """Rollup rows for the last `days` days including today"""
+        today = today or datetime.now(timezone.utc).date()
+        return self.query(start=today - timedelta(days=days - 1), end=today)
+
+    def close(self):
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
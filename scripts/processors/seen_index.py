@@ -0,0 +1,190 @@
+import copy
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+TEXT_FIELDS = ['title', 'description', 'text', 'summary']
+
+
+def normalize_url(url):
+    """Canonical form of a URL: trimmed, lowercase host, no fragment"""
+    url = url.strip() if isinstance(url, str) else ''
+    if not url:
+        return ''
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ''))
+
+
+def item_content(item):
+    """Text used for content hashing, built the same way as deduplicate_data"""
+    content = []
+    for col in TEXT_FIELDS:
+        val = item.get(col, '')
+        if val and val == val:  # skip None/NaN/empty
+            content.append(str(val))
+    return ' '.join(content)
+
+
+def content_hash(content):
+    return hashlib.md5(str(content).encode()).hexdigest()
+
+
+def _digest(kind, value):
+    return hashlib.md5(f"{kind}:{value}".encode()).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 16-byte digests, persisted as raw bits"""
+
+    def __init__(self, capacity=1_000_000, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest):
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, digest):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+    def load(self, path):
+        """Load bits from disk; False if missing or sized for another capacity"""
+        if not os.path.exists(path) or os.path.getsize(path) != len(self.bits):
+            return False
+        with open(path, 'rb') as f:
+            self.bits = bytearray(f.read())
+        return True
+
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+
+class SeenIndex:
+    """Persistent index of URLs and content hashes already processed
+
+    A Bloom filter answers "definitely new" in constant time without
+    touching disk; only probable hits fall through to the SQLite primary
+    key lookup, so the cost per lookup stays flat as history grows.
+
+    Stages that keep their own record of what they have handled (the raw
+    archive vs processed incidents) use scoped(namespace) views over the
+    same file, so one stage marking an item never hides it from another.
+    """
+
+    def __init__(self, path='data/cache/seen.sqlite', capacity=1_000_000, error_rate=0.01):
+        self.path = path
+        self.bloom_path = path + '.bloom'
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen (
+                digest BLOB PRIMARY KEY,
+                first_seen REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+        self.prefix = ''
+        # Shared by every scoped view
+        self.stats = {'hits': 0, 'misses': 0, 'bloom_rejects': 0}
+
+        self.bloom = BloomFilter(capacity, error_rate)
+        if not self.bloom.load(self.bloom_path):
+            for (digest,) in self.conn.execute("SELECT digest FROM seen"):
+                self.bloom.add(digest)
+
+    @property
+    def hits(self):
+        return self.stats['hits']
+
+    @property
+    def misses(self):
+        return self.stats['misses']
+
+    @property
+    def bloom_rejects(self):
+        return self.stats['bloom_rejects']
+
+    def scoped(self, namespace):
+        """View over the same index whose keys are kept apart under namespace"""
+        view = copy.copy(self)
+        view.prefix = f"{namespace}:"
+        return view
+
+    def _keys(self, item):
+        url_kind, hash_kind = self.prefix + 'url', self.prefix + 'hash'
+        keys = []
+        url = normalize_url(item.get('url'))
+        if url:
+            keys.append(_digest(url_kind, url))
+        digest = item.get('content_hash')
+        if not digest:
+            content = item_content(item)
+            digest = content_hash(content) if content else None
+        if digest:
+            keys.append(_digest(hash_kind, digest))
+        # Reports folded into this one by near-duplicate clustering
+        for url in item.get('duplicate_urls') or []:
+            url = normalize_url(url)
+            if url:
+                keys.append(_digest(url_kind, url))
+        for digest in item.get('duplicate_hashes') or []:
+            keys.append(_digest(hash_kind, digest))
+        return keys
+
+    def _contains(self, digest):
+        if digest not in self.bloom:
+            self.stats['bloom_rejects'] += 1
+            return False
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM seen WHERE digest = ?", (digest,)).fetchone()
+        return row is not None
+
+    def is_seen(self, item):
+        """True if the item's URL or content hash was already recorded"""
+        seen = any(self._contains(key) for key in self._keys(item))
+        self.stats['hits' if seen else 'misses'] += 1
+        return seen
+
+    def filter_new(self, items):
+        """Keep only items never seen before"""
+        return [item for item in items if not self.is_seen(item)]
+
+    def add(self, items):
+        """Record the URLs and content hashes of processed items"""
+        now = time.time()
+        rows = []
+        for item in items:
+            for key in self._keys(item):
+                self.bloom.add(key)
+                rows.append((key, now))
+        with self.lock:
+            self.conn.executemany("INSERT OR IGNORE INTO seen (digest, first_seen) VALUES (?, ?)", rows)
+        return len(rows)
+
+    def flush(self):
+        """Persist pending rows and the Bloom filter bits"""
+        with self.lock:
+            # Bits first: a stale filter may only over-report, never miss
+            self.bloom.save(self.bloom_path)
+            self.conn.commit()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
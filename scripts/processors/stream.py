@@ -0,0 +1,121 @@
+"""Micro-batching, the Pipeline runner and the store sink
+
+Everything scrape mode needs to stream collected items into the raw
+store, kept apart from the processing stages in processors.pipeline so
+importing it pulls in no dedup, classify or geocode modules.
+"""
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from processors.incident import incident_frame
+from utils.metrics import metrics
+
+# Put in an item stream to release the partial batch, e.g. when a source completes
+FLUSH = object()
+
+
+def micro_batches(items, size=500, max_wait=None):
+    """Group a stream of Incident records or dicts (or a DataFrame) into DataFrames
+
+    A batch is released when it reaches size items, when the stream
+    yields FLUSH, or when an item arrives max_wait seconds or more after
+    the batch's first one, so a slow trickle still reaches the sinks.
+    """
+    if isinstance(items, pd.DataFrame):
+        for start in range(0, len(items), size):
+            yield items.iloc[start:start + size]
+        return
+
+    batch = []
+    started = None
+    for item in items:
+        if item is not FLUSH:
+            if not batch:
+                started = time.monotonic()
+            batch.append(item)
+        if batch and (item is FLUSH or len(batch) >= size
+                      or (max_wait is not None and time.monotonic() - started >= max_wait)):
+            yield incident_frame(batch)
+            batch = []
+    if batch:
+        yield incident_frame(batch)
+
+
+class Pipeline:
+    """Named per-batch stages applied to a stream of micro-batches
+
+    Each stage is a callable taking and returning a DataFrame. Batches
+    flow through every stage before the next one is pulled, so the first
+    results reach the sinks while collection is still running. Time spent
+    waiting on the source is recorded as the 'collect' stage.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    def run(self, batches):
+        batches = iter(batches)
+        while True:
+            with metrics.stage('collect'):
+                batch = next(batches, None)
+            if batch is None:
+                return
+            for name, stage in self.stages:
+                if batch.empty:
+                    break
+                with metrics.stage(name):
+                    batch = stage(batch)
+            if not batch.empty:
+                yield batch
+
+    def into(self, batches, sinks):
+        """Drain the pipeline into every sink; returns the number of incidents
+
+        Sinks are closed either way; close(ok=False) tells them the drain
+        failed, so they must not commit anything that vouches for it.
+        """
+        total = 0
+        ok = False
+        try:
+            for batch in self.run(batches):
+                total += len(batch)
+                for sink in sinks:
+                    sink.consume(batch)
+            ok = True
+        finally:
+            for sink in sinks:
+                sink.close(ok)
+        return total
+
+
+class StoreSink:
+    """Append each batch to an IncidentStore, then mark it seen"""
+
+    def __init__(self, store, seen_index=None, feed_state=None):
+        self.store = store
+        self.seen_index = seen_index
+        self.feed_state = feed_state
+        self.run_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.batches = 0
+        self.count = 0
+
+    def consume(self, batch):
+        with metrics.stage('store'):
+            self.count += self.store.append(batch, run_id=f"{self.run_id}-{self.batches:04d}")
+            self.batches += 1
+            if self.seen_index is not None:
+                self.seen_index.add(batch.to_dict('records'))
+                self.seen_index.flush()
+
+    def close(self, ok=True):
+        # Feed validators are committed even for an empty run, but never for a failed
+        # one: they would vouch for items that were never stored
+        if self.feed_state is not None:
+            if ok:
+                self.feed_state.flush()
+            else:
+                self.feed_state.rollback()
+        print(f"💾 Saved {self.count} incidents to {self.store.path}")
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from scrapers.news_scraper import NewsScraper
+from scrapers.twitter_scraper import TwitterScraper
+from scrapers.collector import build_session
+from processors.incident import incident_frame
+from processors.region_matcher import get_region_matcher
+from utils.rate_limit import TokenBucket
+
+
+def time_slices(start, end, slice_hours=6):
+    """Split [start, end) into consecutive windows of slice_hours"""
+    step = timedelta(hours=slice_hours)
+    slices = []
+    cursor = start
+    while cursor < end:
+        slices.append((cursor, min(cursor + step, end)))
+        cursor += step
+    return slices
+
+
+class Checkpoint:
+    """JSON record of completed (source, slice) keys, rewritten atomically"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f).get('completed', []))
+
+    @staticmethod
+    def key(source, window):
+        return f"{source}:{window[0]:%Y-%m-%dT%H:%M}/{window[1]:%Y-%m-%dT%H:%M}"
+
+    def is_done(self, source, window):
+        return self.key(source, window) in self.done
+
+    def mark_done(self, source, window):
+        with self.lock:
+            self.done.add(self.key(source, window))
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({'completed': sorted(self.done)}, f, indent=1)
+            os.replace(tmp, self.path)
+
+
+class BackfillRunner:
+    """Walk a historical date range slice by slice for NewsAPI and Twitter
+
+    Slices run concurrently, each paging through its results; every API
+    shares one token bucket so the run stays within its rate budget.
+    A slice is checkpointed only after its items are stored, so an
+    interrupted run resumes at the first unfinished slice. A slice with
+    more results than max_pages holds is split in half until each part
+    fits; one that still overflows at min_slice_minutes keeps what it
+    got but stays unchecked, so the next run retries it.
+    """
+
+    def __init__(self, config, store, seen_index=None):
+        settings = config.get('backfill', {}) or {}
+        limits = settings.get('rate_limits', {}) or {}
+        self.slice_hours = settings.get('slice_hours', 6)
+        self.max_workers = settings.get('max_workers', 4)
+        self.max_pages = settings.get('max_pages', 5)
+        self.min_slice = timedelta(minutes=settings.get('min_slice_minutes', 15))
+        self.checkpoint = Checkpoint(settings.get('checkpoint_path', 'data/cache/backfill_checkpoint.json'))
+        self.store = store
+        self.seen_index = seen_index
+        self.store_lock = threading.Lock()
+
+        self.sources = {}
+        session = build_session(pool_size=self.max_workers)
+        regions = get_region_matcher(config.get('regions', {}))
+        if config.get('newsapi_key'):
+            news = NewsScraper(config['newsapi_key'], session=session, region_matcher=regions)
+            bucket = TokenBucket(limits.get('newsapi', 10), per=60)
+            self.sources['NewsAPI'] = lambda s, e: self._fetch_news(news, bucket, s, e)
+        if config.get('twitter_bearer'):
+            twitter = TwitterScraper(config['twitter_bearer'], region_matcher=regions)
+            bucket = TokenBucket(limits.get('twitter', 30), per=60)
+            self.sources['Twitter'] = lambda s, e: twitter.search_range(s, e, self.max_pages, bucket)
+
+    def _fetch_news(self, news, bucket, start, end):
+        articles, complete = news.search_range(start, end, self.max_pages, bucket)
+        articles = news.filter_relevant(articles)
+        for article in articles:
+            article['source'] = 'NewsAPI'
+        return articles, complete
+
+    def _fetch(self, source, window):
+        """(items, complete) for a window, bisecting it while max_pages cuts results off"""
+        items, complete = self.sources[source](*window)
+        if complete:
+            return items, True
+        start, end = window
+        if end - start < 2 * self.min_slice:
+            print(f"⚠️  {Checkpoint.key(source, window)}: still more than {self.max_pages} pages "
+                  f"at the minimum slice - keeping {len(items)} items, will retry")
+            return items, False
+        middle = start + (end - start) / 2
+        print(f"⚠️  {Checkpoint.key(source, window)}: hit max_pages ({self.max_pages}) - splitting")
+        first, first_complete = self._fetch(source, (start, middle))
+        second, second_complete = self._fetch(source, (middle, end))
+        return first + second, first_complete and second_complete
+
+    def _run_slice(self, source, window):
+        items, complete = self._fetch(source, window)
+        with self.store_lock:
+            if self.seen_index is not None:
+                items = self.seen_index.filter_new(items)
+            if items:
+                self.store.append(incident_frame(items))
+            if self.seen_index is not None:
+                self.seen_index.add(items)
+                self.seen_index.flush()
+        if complete:
+            self.checkpoint.mark_done(source, window)
+        return len(items)
+
+    def run(self, start, end):
+        """Backfill [start, end); returns the number of new items stored"""
+        if not self.sources:
+            print("⚠️  No NewsAPI key or Twitter Bearer - nothing to backfill")
+            return 0
+
+        jobs = [
+            (source, window)
+            for window in time_slices(start, end, self.slice_hours)
+            for source in self.sources
+            if not self.checkpoint.is_done(source, window)
+        ]
+        skipped = len(time_slices(start, end, self.slice_hours)) * len(self.sources) - len(jobs)
+        print(f"⏪ Backfilling {len(jobs)} slices ({skipped} already done)")
+
+        total = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._run_slice, source, window): (source, window)
+                       for source, window in jobs}
+            for future in as_completed(futures):
+                source, window = futures[future]
+                try:
+                    count = future.result()
+                    total += count
+                    print(f"  ✓ {Checkpoint.key(source, window)}: {count} new")
+                except Exception as e:
+                    failed += 1
+                    print(f"  ✗ {Checkpoint.key(source, window)}: {e}")
+
+        if failed:
+            print(f"⚠️  {failed} slices failed - rerun backfill to retry them")
+        print(f"✅ Backfill stored {total} new incidents")
+        return total
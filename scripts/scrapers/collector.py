@@ -0,0 +1,79 @@
+import queue
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def build_session(pool_size=16, user_agent="FrontierWatch/1.0"):
+    """Create a pooled HTTP session shared by every collector"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = user_agent
+    return session
+
+
+class CollectionEngine:
+    """Fan out all sources at once and merge results as they arrive"""
+
+    def __init__(self, max_workers=16, timeout=30, session=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session or build_session(pool_size=max_workers)
+        self.jobs = []
+
+    def add(self, name, fn, timeout=None):
+        """Register a source; fn() must return a list of incident dicts"""
+        self.jobs.append((name, fn, timeout or self.timeout))
+
+    def iter_results(self):
+        """Yield (name, items) per source in completion order
+
+        Up to max_workers sources run at once, each on its own daemon
+        thread. A source that overruns its timeout is abandoned: it yields
+        an empty list and frees its slot, and its thread can neither hold
+        up the remaining sources nor block interpreter shutdown. Each
+        source's clock starts when it gets a slot, not while it waits.
+        """
+        results = queue.Queue()
+        running = {}
+        waiting = list(enumerate(self.jobs))
+
+        def run(key, fn):
+            try:
+                results.put((key, fn(), None))
+            except Exception as e:
+                results.put((key, None, e))
+
+        while waiting or running:
+            while waiting and len(running) < self.max_workers:
+                key, (name, fn, timeout) = waiting.pop(0)
+                running[key] = (name, time.monotonic() + timeout)
+                threading.Thread(target=run, args=(key, fn), name=f"source-{name}", daemon=True).start()
+
+            try:
+                key, items, error = results.get(
+                    timeout=max(0, min(deadline for _, deadline in running.values()) - time.monotonic()))
+            except queue.Empty:
+                key = None
+            if key in running:
+                name, _ = running.pop(key)
+                if error is not None:
+                    print(f"{name} error: {error}")
+                yield name, items or []
+
+            now = time.monotonic()
+            for key, (name, deadline) in list(running.items()):
+                if deadline <= now:
+                    running.pop(key)
+                    print(f"⏱️  {name} timed out - skipping")
+                    yield name, []
+
+    def collect(self):
+        """Run all sources and return the merged incident list"""
+        all_incidents = []
+        for name, items in self.iter_results():
+            all_incidents.extend(items)
+        return all_incidents
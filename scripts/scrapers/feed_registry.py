@@ -0,0 +1,72 @@
+import time
+
+
+class FeedRegistry:
+    """Config-driven RSS feed list with per-feed schedule and health
+
+    Each feed has a polling interval and a priority (lower polls first).
+    Consecutive failures push the next poll out exponentially, capped at
+    max_backoff_minutes, and a success resets the feed to healthy.
+    """
+
+    def __init__(self, feeds, state, default_interval=60, default_priority=5,
+                 max_backoff_minutes=720):
+        self.state = state
+        self.max_backoff = max_backoff_minutes * 60
+        self.feeds = {}
+        for feed in feeds:
+            if not feed.get('url') or feed.get('enabled', True) is False:
+                continue
+            self.feeds[feed['name']] = {
+                'name': feed['name'],
+                'url': feed['url'],
+                'interval': feed.get('interval_minutes', default_interval) * 60,
+                'priority': feed.get('priority', default_priority),
+            }
+
+    @classmethod
+    def from_config(cls, config, state):
+        settings = config.get('rss', {}) or {}
+        return cls(
+            settings.get('feeds', []) or [],
+            state,
+            default_interval=settings.get('default_interval_minutes', 60),
+            default_priority=settings.get('default_priority', 5),
+            max_backoff_minutes=settings.get('max_backoff_minutes', 720),
+        )
+
+    def due(self, now=None):
+        """Feeds whose interval and backoff have elapsed, by priority then staleness"""
+        now = now or time.time()
+        health = self.state.all()
+        due = []
+        for name, feed in self.feeds.items():
+            status = health.get(name, {})
+            next_poll = max((status.get('last_polled') or 0) + feed['interval'],
+                            status.get('backoff_until') or 0)
+            if now >= next_poll:
+                due.append((feed['priority'], status.get('last_polled') or 0, feed))
+        return [feed for _, _, feed in sorted(due, key=lambda d: (d[0], d[1]))]
+
+    def record_success(self, name, now=None):
+        self.state.update(name, last_polled=now or time.time(), failures=0, backoff_until=None)
+
+    def record_failure(self, name, now=None):
+        now = now or time.time()
+        failures = (self.state.get(name).get('failures') or 0) + 1
+        backoff = min(self.feeds[name]['interval'] * 2 ** failures, self.max_backoff)
+        self.state.update(name, last_polled=now, failures=failures, backoff_until=now + backoff)
+        return failures
+
+    def tracked(self, name, fn):
+        """Wrap a fetch so its outcome updates the feed's health"""
+        def run():
+            try:
+                entries = fn()
+            except Exception:
+                failures = self.record_failure(name)
+                print(f"⚠️  RSS {name}: {failures} consecutive failure(s), backing off")
+                raise
+            self.record_success(name)
+            return entries
+        return run
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import threading
+
+
+class FeedStateStore:
+    """Per-feed HTTP validators, last-seen entry time and health, in SQLite
+
+    Updates are staged on the connection and only committed by flush(),
+    so a run that dies before its items are stored re-fetches them.
+    """
+
+    FIELDS = ['etag', 'last_modified', 'last_seen', 'last_polled', 'failures', 'backoff_until']
+    COLUMNS = {
+        'etag': 'TEXT',
+        'last_modified': 'TEXT',
+        'last_seen': 'REAL',
+        'last_polled': 'REAL',
+        'failures': 'INTEGER NOT NULL DEFAULT 0',
+        'backoff_until': 'REAL',
+    }
+
+    def __init__(self, path='data/cache/feeds.sqlite'):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("CREATE TABLE IF NOT EXISTS feeds (name TEXT PRIMARY KEY)")
+        existing = {row['name'] for row in self.conn.execute("PRAGMA table_info(feeds)")}
+        for column, decl in self.COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE feeds ADD COLUMN {column} {decl}")
+        self.conn.commit()
+
+    def all(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM feeds").fetchall()
+        return {row['name']: dict(row) for row in rows}
+
+    def get(self, name):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM feeds WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row else {}
+
+    def update(self, name, **fields):
+        fields = {k: v for k, v in fields.items() if k in self.FIELDS}
+        if not fields:
+            return
+        with self.lock:
+            self.conn.execute("INSERT OR IGNORE INTO feeds (name) VALUES (?)", (name,))
+            assignments = ', '.join(f"{k} = ?" for k in fields)
+            self.conn.execute(f"UPDATE feeds SET {assignments} WHERE name = ?", (*fields.values(), name))
+
+    def flush(self):
+        with self.lock:
+            self.conn.commit()
+
+    def rollback(self):
+        """Drop staged updates, e.g. when the run failed before storing its items"""
+        with self.lock:
+            self.conn.rollback()
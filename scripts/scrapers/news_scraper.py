@@ -1,11 +1,16 @@
 import requests
-import json
 from datetime import datetime, timedelta
-import yaml
+
+from processors.region_matcher import get_region_matcher
 
 class NewsScraper:
-    def __init__(self, api_key):
+    QUERY = 'terror OR terrorist OR encounter OR militant OR attack OR explosion OR IED OR ambush OR infiltration OR "ceasefire violation" OR gunfight (Jammu OR Kashmir OR Manipur OR Nagaland OR Assam OR Mizoram OR Tripura OR Meghalaya OR "Arunachal Pradesh")'
+    
+    def __init__(self, api_key, session=None, timeout=30, region_matcher=None):
         self.api_key = api_key
+        self.regions = region_matcher or get_region_matcher()
+        self.session = session or requests.Session()
+        self.timeout = timeout
         self.base_url = "https://newsapi.org/v2/everything"
     
     def search_incidents(self, hours_back=6):
@@ -13,51 +18,61 @@ class NewsScraper:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(hours=hours_back)
         
+        try:
+            return self._fetch_page(start_date, end_date)['articles']
+        except Exception as e:
+            print(f"NewsAPI error: {e}")
+            return []
+    
+    def search_range(self, start_date, end_date, max_pages=5, rate_limiter=None):
+        """Fetch every page of results for a past time window
+        
+        Returns (articles, complete); complete is False when max_pages
+        ran out before the results did. Errors propagate so a backfill
+        slice that fails can be retried.
+        """
+        articles = []
+        for page in range(1, max_pages + 1):
+            if rate_limiter:
+                rate_limiter.acquire()
+            data = self._fetch_page(start_date, end_date, page)
+            batch = data.get('articles', [])
+            articles.extend(batch)
+            if not batch or len(articles) >= data.get('totalResults', 0):
+                return articles, True
+        return articles, False
+    
+    def _fetch_page(self, start_date, end_date, page=1):
         params = {
-            'q': 'terror OR terrorist OR encounter OR militant OR attack OR explosion OR IED OR ambush OR infiltration OR "ceasefire violation" OR gunfight (Jammu OR Kashmir OR Manipur OR Nagaland OR Assam OR Mizoram OR Tripura OR Meghalaya OR "Arunachal Pradesh")',
+            'q': self.QUERY,
             'from': start_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
             'to': end_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
             'language': 'en',
             'sortBy': 'publishedAt',
             'pageSize': 100,
+            'page': page,
             'apiKey': self.api_key
         }
-        
-        try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()['articles']
-        except Exception as e:
-            print(f"NewsAPI error: {e}")
-            return []
+        response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
     
     def filter_relevant(self, articles):
         """Filter articles by region relevance"""
-        jk_keywords = ['Jammu', 'Kashmir', 'J&K', 'Srinagar']
-        ne_keywords = ['Manipur', 'Nagaland', 'Assam', 'Mizoram', 'Tripura', 'Meghalaya', 'Arunachal']
-        
         relevant = []
         for article in articles:
             title = article.get('title', '') or ''
             description = article.get('description', '') or ''
-            content = (title + ' ' + description).lower()
+            region = self.regions.classify(title + ' ' + description)
             
-            if any(kw.lower() in content for kw in jk_keywords + ne_keywords):
+            if region != 'Other':
                 relevant.append({
                     'title': title,
                     'description': description,
                     'url': article.get('url', ''),
                     'published': article.get('publishedAt', ''),
                     'source': article.get('source', {}).get('name', 'Unknown'),
-                    'region': self._classify_region(content)
+                    'region': region
                 })
         return relevant
     
-    def _classify_region(self, text):
-        """Simple region classification"""
-        text = text.lower()
-        if any(word in text for word in ['jammu', 'kashmir', 'j&k', 'srinagar']):
-            return 'Jammu & Kashmir'
-        elif any(state in text for state in ['manipur', 'nagaland', 'assam', 'mizoram', 'tripura', 'meghalaya', 'arunachal']):
-            return 'North East'
-        return 'Other'
@@ -1,49 +1,91 @@
 import feedparser
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+from processors.region_matcher import get_region_matcher
+from utils.metrics import metrics
 
 class RSSScraper:
-    def __init__(self):
-        self.feeds = {
-            'hindu': 'https://www.thehindu.com/feeder/default.rss',
-            'toi': 'https://timesofindia.indiatimes.com/rssfeedstopstories.cms',
-            'india_today': 'https://www.indiatoday.in/rss/1206578',
-            'business_standard': 'https://www.business-standard.com/rss/home'
-        }
+    DEFAULT_FEEDS = {
+        'hindu': 'https://www.thehindu.com/feeder/default.rss',
+        'toi': 'https://timesofindia.indiatimes.com/rssfeedstopstories.cms',
+        'india_today': 'https://www.indiatoday.in/rss/1206578',
+        'business_standard': 'https://www.business-standard.com/rss/home'
+    }
+    
+    def __init__(self, session=None, timeout=30, state=None, feeds=None, region_matcher=None):
+        self.session = session or requests.Session()
+        self.regions = region_matcher or get_region_matcher()
+        self.timeout = timeout
+        self.state = state
+        self.feeds = dict(feeds) if feeds else dict(self.DEFAULT_FEEDS)
     
     def scrape_feeds(self, hours_back=6):
-        """Scrape RSS feeds for incidents"""
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(hours=hours_back)
-        
-        all_entries = []
+        """All new entries from every feed, in feed order"""
+        return list(self.iter_entries(hours_back))
+    
+    def iter_entries(self, hours_back=6):
+        """Yield new entries feed by feed, skipping feeds that fail"""
+        start_time = datetime.utcnow() - timedelta(hours=hours_back)
         for name, url in self.feeds.items():
             try:
-                feed = feedparser.parse(url)
-                for entry in feed.entries:
-                    pub_date = entry.get('published_parsed')
-                    if pub_date and datetime(*pub_date[:6]) > start_time:
-                        all_entries.append({
-                            'title': entry.title,
-                            'summary': entry.get('summary', ''),
-                            'url': entry.link,
-                            'published': entry.published if 'published' in entry else '',
-                            'source': name.title(),
-                            'region': self._classify_region(entry.title + ' ' + entry.summary)
-                        })
+                yield from self.scrape_feed(name, url, start_time)
             except Exception as e:
                 print(f"RSS {name} error: {e}")
-        
-        return all_entries[:100]  # Limit results
     
-    def _classify_region(self, text):
-        """Classify RSS content by region"""
-        text = text.lower()
-        jk_words = ['jammu', 'kashmir', 'j&k']
-        ne_words = ['manipur', 'nagaland', 'assam', 'mizoram', 'tripura', 'meghalaya', 'arunachal']
+    def scrape_feed(self, name, url, start_time):
+        """Fetch and parse a single feed through the shared session
         
-        if any(word in text for word in jk_words):
-            return 'Jammu & Kashmir'
-        elif any(word in text for word in ne_words):
-            return 'North East'
-        return 'Other'
+        Sends the stored ETag/Last-Modified validators so unchanged feeds
+        come back as an empty 304, and skips entries no newer than the
+        last one already seen (start_time for a feed never seen before).
+        """
+        state = self.state.get(name) if self.state else {}
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            metrics.count('rss.not_modified')
+            return []
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
+        
+        # A feed polled less often than hours_back must not lose the gap since its last
+        # poll; start_time only bounds feeds never seen before
+        cutoff = start_time
+        if state.get('last_seen'):
+            cutoff = datetime.utcfromtimestamp(state['last_seen'])
+        
+        entries = []
+        newest = None
+        for entry in feed.entries:
+            pub_date = entry.get('published_parsed')
+            if not pub_date:
+                continue
+            published = datetime(*pub_date[:6])
+            if published <= cutoff:
+                continue  # feeds are not reliably newest-first
+            newest = max(newest, published) if newest else published
+            entries.append({
+                'title': entry.title,
+                'summary': entry.get('summary', ''),
+                'url': entry.link,
+                'published': entry.published if 'published' in entry else '',
+                'source': name.title(),
+                'region': self.regions.classify(entry.title + ' ' + entry.get('summary', ''))
+            })
+        
+        if self.state:
+            self.state.update(
+                name,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                last_seen=(newest.replace(tzinfo=timezone.utc).timestamp() if newest
+                           else state.get('last_seen'))
+            )
+        return entries
+    
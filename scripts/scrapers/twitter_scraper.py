@@ -1,16 +1,23 @@
-import tweepy
-import json
 from datetime import datetime, timedelta
 
+from processors.region_matcher import get_region_matcher
+
 class TwitterScraper:
-    def __init__(self, bearer_token):
+    QUERY = 'terror OR terrorist OR encounter OR militant OR attack OR explosion OR IED OR ambush OR infiltration OR "ceasefire violation" OR gunfight (Jammu OR Kashmir OR Manipur OR Nagaland OR Assam OR Mizoram OR Tripura OR Meghalaya OR Arunachal) -is:retweet lang:en'
+    TWEET_FIELDS = ['created_at', 'author_id', 'public_metrics']
+    
+    def __init__(self, bearer_token, region_matcher=None):
         self.bearer_token = bearer_token
+        self.regions = region_matcher or get_region_matcher()
         self.client = None
     
-    def authenticate(self):
+    def authenticate(self, wait_on_rate_limit=False):
         """Authenticate with Twitter API v2"""
         try:
-            self.client = tweepy.Client(bearer_token=self.bearer_token)
+            import tweepy
+
+            self.client = tweepy.Client(bearer_token=self.bearer_token,
+                                        wait_on_rate_limit=wait_on_rate_limit)
             return True
         except Exception as e:
             print(f"Twitter auth error: {e}")
@@ -26,40 +33,66 @@ class TwitterScraper:
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(hours=hours_back)
         
-        query = 'terror OR terrorist OR encounter OR militant OR attack OR explosion OR IED OR ambush OR infiltration OR "ceasefire violation" OR gunfight (Jammu OR Kashmir OR Manipur OR Nagaland OR Assam OR Mizoram OR Tripura OR Meghalaya OR Arunachal) -is:retweet lang:en'
-        
         tweets = []
         try:
             response = self.client.search_recent_tweets(
-                query=query,
+                query=self.QUERY,
                 max_results=100,
                 start_time=start_time,
                 end_time=end_time,
-                tweet_fields=['created_at', 'author_id', 'public_metrics']
+                tweet_fields=self.TWEET_FIELDS
             )
             
             if response.data:
-                for tweet in response.data:
-                    tweets.append({
-                        'title': tweet.text[:100] + '...' if len(tweet.text) > 100 else tweet.text,
-                        'description': '',
-                        'text': tweet.text,
-                        'url': f'https://twitter.com/i/status/{tweet.id}',
-                        'published': tweet.created_at.isoformat(),
-                        'source': 'Twitter',
-                        'region': self._classify_region(tweet.text)
-                    })
+                tweets = [self._to_incident(tweet) for tweet in response.data]
             print(f"✅ Twitter: {len(tweets)} tweets")
         except Exception as e:
             print(f"Twitter search error: {e}")
         
         return tweets
     
-    def _classify_region(self, text):
-        """Classify tweet by region"""
-        text = text.lower()
-        if any(word in text for word in ['jammu', 'kashmir']):
-            return 'Jammu & Kashmir'
-        elif any(state in text for state in ['manipur', 'nagaland', 'assam', 'mizoram', 'tripura', 'meghalaya', 'arunachal']):
-            return 'North East'
-        return 'Other'
+    def search_range(self, start_time, end_time, max_pages=10, rate_limiter=None):
+        """Follow next_token pagination over a past time window
+        
+        Windows older than the 7-day recent-search horizon use the
+        full-archive endpoint. Returns (tweets, complete); complete is
+        False when max_pages ran out with a next_token still pending.
+        Errors propagate so the slice is retried.
+        """
+        if not self.client and not self.authenticate(wait_on_rate_limit=True):
+            raise RuntimeError("Twitter authentication failed")
+        
+        recent_horizon = datetime.utcnow() - timedelta(days=7)
+        search = (self.client.search_recent_tweets if start_time > recent_horizon
+                  else self.client.search_all_tweets)
+        
+        tweets = []
+        next_token = None
+        for _ in range(max_pages):
+            if rate_limiter:
+                rate_limiter.acquire()
+            response = search(
+                query=self.QUERY,
+                max_results=100,
+                start_time=start_time,
+                end_time=end_time,
+                next_token=next_token,
+                tweet_fields=self.TWEET_FIELDS
+            )
+            tweets.extend(self._to_incident(tweet) for tweet in response.data or [])
+            next_token = (response.meta or {}).get('next_token')
+            if not next_token:
+                return tweets, True
+        return tweets, False
+    
+    def _to_incident(self, tweet):
+        return {
+            'title': tweet.text[:100] + '...' if len(tweet.text) > 100 else tweet.text,
+            'description': '',
+            'text': tweet.text,
+            'url': f'https://twitter.com/i/status/{tweet.id}',
+            'published': tweet.created_at.isoformat(),
+            'source': 'Twitter',
+            'region': self.regions.classify(tweet.text)
+        }
+    
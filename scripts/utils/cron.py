@@ -0,0 +1,148 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+# (low, high) for minute, hour, day of month, month, day of week (0 or 7 = Sunday)
+FIELD_BOUNDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(spec, low, high):
+    """Set of values for one cron field: *, */n, a, a-b, a-b/n and comma lists"""
+    values = set()
+    for part in spec.split(','):
+        rng, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if rng == '*':
+            start, end = low, high
+        elif '-' in rng:
+            start, end = (int(v) for v in rng.split('-', 1))
+        else:
+            start = int(rng)
+            end = high if step > 1 else start
+        if not (low <= start <= end <= high) or step < 1:
+            raise ValueError(f"cron field out of range: {part!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Standard five-field cron expression, evaluated in UTC
+
+    As in cron, when both day-of-month and day-of-week are restricted a
+    day matches if either does.
+    """
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"expected 5 cron fields, got {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(spec, low, high) for spec, (low, high) in zip(fields, FIELD_BOUNDS)
+        )
+        self.weekdays = {d % 7 for d in weekdays}
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def _day_matches(self, dt):
+        in_month = dt.day in self.days
+        in_week = (dt.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def matches(self, dt):
+        return (dt.minute in self.minutes and dt.hour in self.hours
+                and dt.month in self.months and self._day_matches(dt))
+
+    def next_after(self, dt):
+        """First matching minute strictly after dt"""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                year, month = (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+                dt = dt.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+            elif dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"cron expression never fires: {self.expression!r}")
+
+
+class CronScheduler:
+    """Run named jobs on cron schedules, one at a time, in the calling thread
+
+    A job that overruns its next slot is not queued up; it simply runs
+    again at the first slot after it finishes.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    @staticmethod
+    def now():
+        return datetime.now(timezone.utc)
+
+    def add(self, name, expression, fn):
+        schedule = CronSchedule(expression)
+        with self.lock:
+            self.jobs[name] = {
+                'schedule': schedule, 'fn': fn, 'next_run': schedule.next_after(self.now()),
+                'runs': 0, 'failures': 0, 'last_run': None, 'last_seconds': None, 'last_error': None,
+            }
+
+    def run_pending(self):
+        """Run every job that is due; returns the names that ran"""
+        ran = []
+        for name, job in sorted(self.jobs.items(), key=lambda item: item[1]['next_run']):
+            if self.stopped.is_set() or job['next_run'] > self.now():
+                continue
+            started = time.perf_counter()
+            error = None
+            try:
+                job['fn']()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                print(f"❌ Scheduled job {name} failed: {error}")
+            with self.lock:
+                job['runs'] += 1
+                job['failures'] += int(error is not None)
+                job['last_run'] = self.now()
+                job['last_seconds'] = round(time.perf_counter() - started, 3)
+                job['last_error'] = error
+                job['next_run'] = job['schedule'].next_after(self.now())
+            ran.append(name)
+        return ran
+
+    def run_forever(self, max_sleep=60):
+        while not self.stopped.is_set():
+            self.run_pending()
+            with self.lock:
+                upcoming = min((job['next_run'] for job in self.jobs.values()), default=None)
+            wait = max_sleep if upcoming is None else (upcoming - self.now()).total_seconds()
+            self.stopped.wait(min(max(wait, 0.5), max_sleep))
+
+    def stop(self):
+        self.stopped.set()
+
+    def status(self):
+        with self.lock:
+            return {
+                name: {
+                    'schedule': job['schedule'].expression,
+                    'next_run': job['next_run'].isoformat(),
+                    'last_run': job['last_run'].isoformat() if job['last_run'] else None,
+                    'last_seconds': job['last_seconds'],
+                    'last_error': job['last_error'],
+                    'runs': job['runs'],
+                    'failures': job['failures'],
+                }
+                for name, job in self.jobs.items()
+            }
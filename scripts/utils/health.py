@@ -0,0 +1,60 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class HealthServer:
+    """Local HTTP endpoint for liveness and metrics
+
+    GET /health answers 200 while is_healthy() holds and 503 otherwise;
+    GET /metrics returns whatever report() produces as JSON.
+    """
+
+    def __init__(self, report, is_healthy=lambda: True, host='127.0.0.1', port=8080):
+        self.report = report
+        self.is_healthy = is_healthy
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def _handler(self):
+        health = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0].rstrip('/')
+                if path == '/health':
+                    ok = health.is_healthy()
+                    self._send(200 if ok else 503, {'status': 'ok' if ok else 'unhealthy'})
+                elif path == '/metrics':
+                    self._send(200, health.report())
+                else:
+                    self._send(404, {'error': 'not found', 'endpoints': ['/health', '/metrics']})
+
+            def _send(self, code, body):
+                payload = json.dumps(body, default=str).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"🩺 Health endpoint: http://{self.host}:{self.port}/health")
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,135 @@
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+
+class RunMetrics:
+    """Per-run timers, counters, bytes fetched and cache hit rates
+
+    Thread-safe, so collector threads can record into it directly.
+    With profiling enabled, every stage also dumps a cProfile file and
+    its top tracemalloc allocations.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, mode=None):
+        with self.lock:
+            self.mode = mode
+            self.started = time.time()
+            self.stages = {}
+            self.sources = {}
+            self.counters = {}
+            self.caches = {}
+            self.profile_dir = None
+
+    def enable_profiling(self, output_dir='data/profile'):
+        os.makedirs(output_dir, exist_ok=True)
+        self.profile_dir = output_dir
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage (and profile it when profiling is on)"""
+        profiler = None
+        if self.profile_dir:
+            tracemalloc.reset_peak()
+            profiler = cProfile.Profile()
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = None
+            if profiler:
+                profiler.disable()
+                peak = tracemalloc.get_traced_memory()[1]
+                profiler.dump_stats(os.path.join(self.profile_dir, f"{name}.prof"))
+                self._dump_allocations(name)
+            with self.lock:
+                entry = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+                entry['seconds'] = round(entry['seconds'] + elapsed, 4)
+                entry['calls'] += 1
+                if peak is not None:
+                    entry['peak_memory_bytes'] = max(peak, entry.get('peak_memory_bytes', 0))
+
+    def _dump_allocations(self, name, top=25):
+        stats = tracemalloc.take_snapshot().statistics('lineno')[:top]
+        with open(os.path.join(self.profile_dir, f"{name}.alloc.txt"), 'w') as f:
+            for stat in stats:
+                f.write(f"{stat}\n")
+
+    def timed_source(self, name, fn):
+        """Wrap a collector job so its latency, item count and errors are recorded"""
+        def run():
+            start = time.perf_counter()
+            try:
+                items = fn()
+            except Exception:
+                self.record_source(name, time.perf_counter() - start, 0, error=True)
+                raise
+            self.record_source(name, time.perf_counter() - start, len(items or []))
+            return items
+        return run
+
+    def record_source(self, name, seconds, items, error=False):
+        with self.lock:
+            entry = self.sources.setdefault(name, {'seconds': 0.0, 'items': 0, 'errors': 0})
+            entry['seconds'] = round(entry['seconds'] + seconds, 4)
+            entry['items'] += items
+            entry['errors'] += int(error)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_bytes(self, source, n):
+        self.count(f"bytes.{source}", n)
+
+    def record_cache(self, name, hits, misses):
+        with self.lock:
+            entry = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+            entry['hits'] += hits
+            entry['misses'] += misses
+            total = entry['hits'] + entry['misses']
+            entry['hit_rate'] = round(entry['hits'] / total, 4) if total else None
+
+    def track_session(self, session):
+        """Count response bytes per host on a requests.Session"""
+        def on_response(response, *args, **kwargs):
+            self.add_bytes(urlsplit(response.url).netloc or 'unknown', len(response.content or b''))
+        session.hooks['response'].append(on_response)
+        return session
+
+    def report(self):
+        with self.lock:
+            return {
+                'mode': self.mode,
+                'started': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+                'total_seconds': round(time.time() - self.started, 4),
+                'stages': dict(self.stages),
+                'sources': dict(self.sources),
+                'counters': dict(self.counters),
+                'caches': dict(self.caches),
+            }
+
+    def write(self, path='data/run_report.json'):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"⏱️  Run report: {path}")
+        return path
+
+
+metrics = RunMetrics()